@@ -2,7 +2,10 @@
 Matrix sticker room emote mixin
 """
 
+import asyncio
 import mimetypes
+import re
+import time
 import uuid
 from pathlib import Path
 
@@ -10,6 +13,11 @@ from astrbot.api import logger
 from astrbot.api.event import AstrMessageEvent
 from astrbot.core.utils.astrbot_path import get_astrbot_temp_path
 
+_ROOM_EMOTE_SHORTCODE_PATTERN = re.compile(r"\A[A-Za-z0-9_-]+\Z")
+_ROOM_EMOTES_TYPE = "im.ponies.room_emotes"
+_ROOM_EMOTE_STATE_KEYS_TTL_SECONDS = 300.0
+_MISSING = object()
+
 
 class StickerRoomEmoteMixin:
     """房间自定义表情相关命令"""
@@ -20,15 +28,19 @@ class StickerRoomEmoteMixin:
         return room_id or None
 
     async def _get_image_mxc_from_reply(
-        self, event: AstrMessageEvent
+        self, event: AstrMessageEvent, room_id: str | None = None
     ) -> tuple[str | None, str | None]:
         """从引用消息中获取图片 mxc URL 和 mimetype
 
+        Args:
+            room_id: 调用方已解析的房间 ID，未提供时从事件中解析
+
         Returns:
             (mxc_url, mimetype) 或 (None, None)
         """
         try:
-            room_id = self._resolve_room_id(event)
+            if room_id is None:
+                room_id = self._resolve_room_id(event)
             if not room_id:
                 return None, None
             reply_event_id = None
@@ -128,6 +140,59 @@ class StickerRoomEmoteMixin:
             return None
         return await self._download_mxc_to_temp_file(event, mxc_url, mimetype)
 
+    @staticmethod
+    def _build_room_emote_pack(state_key: str, content: dict) -> tuple[str, str, dict]:
+        images = content.get("images", {})
+        pack_info = content.get("pack", {})
+        display_name = pack_info.get("display_name", state_key or "默认")
+        return state_key, display_name, images
+
+    def _remember_room_emote_state_key(self, room_id: str, state_key: str) -> None:
+        known = getattr(self, "_room_emote_state_keys", {})
+        entry = known.get(room_id)
+        if entry is not None and state_key not in entry[1]:
+            known[room_id] = (entry[0], tuple(sorted({*entry[1], state_key})))
+
+    async def _fetch_room_emote_packs(
+        self, client, room_id: str
+    ) -> list[tuple[str, str, dict]]:
+        """读取房间表情包，已知 state_key 时逐个查询，避免拉取完整房间状态。"""
+        known = getattr(self, "_room_emote_state_keys", None)
+        if known is None:
+            known = {}
+            self._room_emote_state_keys = known
+
+        entry = known.get(room_id)
+        now = time.monotonic()
+        if entry is not None and now - entry[0] < _ROOM_EMOTE_STATE_KEYS_TTL_SECONDS:
+            state_keys = entry[1]
+            contents = await asyncio.gather(
+                *(
+                    client.get_room_state_event(room_id, _ROOM_EMOTES_TYPE, sk)
+                    for sk in state_keys
+                ),
+                return_exceptions=True,
+            )
+            emote_packs = [
+                self._build_room_emote_pack(sk, content)
+                for sk, content in zip(state_keys, contents, strict=True)
+                if isinstance(content, dict)
+            ]
+            if emote_packs:
+                return emote_packs
+
+        state = await client.get_room_state(room_id)
+        emote_packs = []
+        for ev in state:
+            if ev.get("type") == _ROOM_EMOTES_TYPE:
+                emote_packs.append(
+                    self._build_room_emote_pack(
+                        ev.get("state_key", ""), ev.get("content", {})
+                    )
+                )
+        known[room_id] = (now, tuple(sorted({pack[0] for pack in emote_packs})))
+        return emote_packs
+
     async def cmd_add_room_emote(
         self, event: AstrMessageEvent, shortcode: str, state_key: str = ""
     ) -> str:
@@ -144,7 +209,7 @@ class StickerRoomEmoteMixin:
         if not room_id:
             return "无法获取当前房间 ID"
 
-        mxc_url, mimetype = await self._get_image_mxc_from_reply(event)
+        mxc_url, mimetype = await self._get_image_mxc_from_reply(event, room_id)
         if not mxc_url:
             return (
                 "请引用一条包含图片或 sticker 的消息\n\n"
@@ -161,22 +226,20 @@ class StickerRoomEmoteMixin:
         if not shortcode:
             return "请提供有效的短码名称"
 
-        import re
-
-        if not re.match(r"^[a-zA-Z0-9_-]+$", shortcode):
+        if not _ROOM_EMOTE_SHORTCODE_PATTERN.match(shortcode):
             return "短码只能包含字母、数字、下划线和连字符"
 
         try:
-            room_emotes_type = "im.ponies.room_emotes"
-
             try:
                 current_state = await client.get_room_state_event(
-                    room_id, room_emotes_type, state_key
+                    room_id, _ROOM_EMOTES_TYPE, state_key
                 )
             except Exception:
                 current_state = {}
+            if not isinstance(current_state, dict):
+                current_state = {}
 
-            images = current_state.get("images", {})
+            images = current_state.setdefault("images", {})
             if shortcode in images:
                 return f"短码 :{shortcode}: 已存在于该房间"
 
@@ -187,16 +250,10 @@ class StickerRoomEmoteMixin:
                 },
             }
 
-            pack_info = current_state.get("pack", {})
-            new_content = {
-                "images": images,
-            }
-            if pack_info:
-                new_content["pack"] = pack_info
-
             await client.set_room_state_event(
-                room_id, room_emotes_type, new_content, state_key
+                room_id, _ROOM_EMOTES_TYPE, current_state, state_key
             )
+            self._remember_room_emote_state_key(room_id, state_key)
 
             return (
                 f"✅ 已添加表情 :{shortcode}: 到房间\n"
@@ -231,29 +288,19 @@ class StickerRoomEmoteMixin:
             return "请提供要移除的短码名称"
 
         try:
-            room_emotes_type = "im.ponies.room_emotes"
-
             try:
                 current_state = await client.get_room_state_event(
-                    room_id, room_emotes_type, state_key
+                    room_id, _ROOM_EMOTES_TYPE, state_key
                 )
             except Exception:
                 return "该房间没有自定义表情包"
 
             images = current_state.get("images", {})
-
-            if shortcode not in images:
+            if images.pop(shortcode, _MISSING) is _MISSING:
                 return f"未找到表情 :{shortcode}:"
 
-            del images[shortcode]
-
-            new_content = {"images": images}
-            pack_info = current_state.get("pack", {})
-            if pack_info:
-                new_content["pack"] = pack_info
-
             await client.set_room_state_event(
-                room_id, room_emotes_type, new_content, state_key
+                room_id, _ROOM_EMOTES_TYPE, current_state, state_key
             )
 
             return f"✅ 已从房间移除表情 :{shortcode}:"
@@ -281,38 +328,24 @@ class StickerRoomEmoteMixin:
             return "无法获取当前房间 ID"
 
         try:
-            room_emotes_type = "im.ponies.room_emotes"
-
-            state = await client.get_room_state(room_id)
-
-            emote_packs = []
-            for ev in state:
-                if ev.get("type") == room_emotes_type:
-                    sk = ev.get("state_key", "")
-                    content = ev.get("content", {})
-                    images = content.get("images", {})
-                    pack_info = content.get("pack", {})
-                    display_name = pack_info.get("display_name", sk or "默认")
-                    emote_packs.append((sk, display_name, images))
+            emote_packs = await self._fetch_room_emote_packs(client, room_id)
 
             if not emote_packs:
                 return "该房间没有自定义表情"
 
-            lines = ["**房间自定义表情**\n"]
+            multi_pack = len(emote_packs) > 1
+            parts = ["**房间自定义表情**\n"]
 
             for sk, display_name, images in emote_packs:
-                if len(emote_packs) > 1:
-                    lines.append(f"**{display_name}** (state_key: {sk or '默认'}):")
-
-                if not images:
-                    lines.append("  (空)")
+                if multi_pack:
+                    parts.append(f"**{display_name}** (state_key: {sk or '默认'}):")
+                if images:
+                    parts.append("\n".join(f"  :{sc}:" for sc in sorted(images)))
                 else:
-                    for shortcode in sorted(images.keys()):
-                        lines.append(f"  :{shortcode}:")
-
-                lines.append(f"  共 {len(images)} 个表情\n")
+                    parts.append("  (空)")
+                parts.append(f"  共 {len(images)} 个表情\n")
 
-            return "\n".join(lines)
+            return "\n".join(parts)
 
         except Exception as e:
             logger.error(f"列出房间表情失败：{e}")
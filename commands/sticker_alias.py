@@ -23,13 +23,9 @@ class StickerAliasMixin(StickerBaseMixin):
 - add/remove 需要管理员权限
 - 别名存储在 sticker 的 tags 字段中"""
 
-    def cmd_add_alias(self, sticker_id: str, alias: str) -> str:
+    async def cmd_add_alias(self, sticker_id: str, alias: str) -> str:
         """为 sticker 添加别名"""
-        sticker_meta = None
-        for meta in self._storage.list_stickers(limit=1000):
-            if meta.sticker_id.startswith(sticker_id):
-                sticker_meta = meta
-                break
+        sticker_meta = await self._find_sticker_meta_by_prefix_async(sticker_id)
 
         if sticker_meta is None:
             return f"未找到 sticker: {sticker_id}"
@@ -41,18 +37,14 @@ class StickerAliasMixin(StickerBaseMixin):
             return f"别名 '{alias}' 已存在"
 
         sticker_meta.tags.append(alias)
-        self._storage.save_index()
-        self._invalidate_sticker_lookup_cache()
+        self._schedule_index_flush()
+        self._invalidate_sticker_lookup_cache(reload_storage=False)
 
         return f"已为 sticker {sticker_meta.sticker_id[:8]} 添加别名：{alias}"
 
-    def cmd_remove_alias(self, sticker_id: str, alias: str) -> str:
+    async def cmd_remove_alias(self, sticker_id: str, alias: str) -> str:
         """移除 sticker 别名"""
-        sticker_meta = None
-        for meta in self._storage.list_stickers(limit=1000):
-            if meta.sticker_id.startswith(sticker_id):
-                sticker_meta = meta
-                break
+        sticker_meta = await self._find_sticker_meta_by_prefix_async(sticker_id)
 
         if sticker_meta is None:
             return f"未找到 sticker: {sticker_id}"
@@ -61,18 +53,14 @@ class StickerAliasMixin(StickerBaseMixin):
             return f"别名 '{alias}' 不存在"
 
         sticker_meta.tags.remove(alias)
-        self._storage.save_index()
-        self._invalidate_sticker_lookup_cache()
+        self._schedule_index_flush()
+        self._invalidate_sticker_lookup_cache(reload_storage=False)
 
         return f"已移除别名：{alias}"
 
-    def cmd_list_aliases(self, sticker_id: str) -> str:
+    async def cmd_list_aliases(self, sticker_id: str) -> str:
         """列出 sticker 的所有别名"""
-        sticker_meta = None
-        for meta in self._storage.list_stickers(limit=1000):
-            if meta.sticker_id.startswith(sticker_id):
-                sticker_meta = meta
-                break
+        sticker_meta = await self._find_sticker_meta_by_prefix_async(sticker_id)
 
         if sticker_meta is None:
             return f"未找到 sticker: {sticker_id}"
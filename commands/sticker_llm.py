@@ -2,8 +2,13 @@
 Matrix sticker LLM mixin - LLM 相关 hook 逻辑
 """
 
+import asyncio
 import hashlib
+import logging
 import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -36,34 +41,69 @@ STICKER_PROMPT_TEMPLATE = """
 """
 
 
+_DEFAULT_PROMPT_INJECTION_MODE = "on"
+_SUPPORTED_PROMPT_INJECTION_MODES = frozenset({"on", "off"})
+_PROMPT_INJECTION_MODE_ALIASES = {
+    "on": "on",
+    "enable": "on",
+    "enabled": "on",
+    "true": "on",
+    "1": "on",
+    "yes": "on",
+    "inject": "on",
+    "injection": "on",
+    "runtime": "on",
+    "prompt": "on",
+    "hybrid": "on",
+    "both": "on",
+    "off": "off",
+    "disable": "off",
+    "disabled": "off",
+    "false": "off",
+    "0": "off",
+    "no": "off",
+    "fc": "off",
+    "tool": "off",
+    "tools": "off",
+}
+
+
+@lru_cache(maxsize=32)
+def _normalize_prompt_injection_mode_cached(raw: str) -> str:
+    """归一化提示词注入模式，无法识别时回退为默认模式。"""
+    normalized = raw.strip().lower()
+    normalized = _PROMPT_INJECTION_MODE_ALIASES.get(normalized, normalized)
+    if normalized in _SUPPORTED_PROMPT_INJECTION_MODES:
+        return normalized
+    return _DEFAULT_PROMPT_INJECTION_MODE
+
+
+@lru_cache(maxsize=128)
+def _coerce_bool_string(raw: str) -> bool | None:
+    """将配置字符串解析为布尔值，无法识别时返回 None。"""
+    normalized = raw.strip().lower()
+    if normalized in {"1", "true", "yes", "on", "enable", "enabled"}:
+        return True
+    if normalized in {"0", "false", "no", "off", "disable", "disabled"}:
+        return False
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class _ResolvedFlags:
+    """单次 hook 调用内解析好的配置开关快照"""
+
+    runtime_injection: bool
+    full_intercept: bool
+    strict: bool
+    emoji: bool
+    cross_platform: bool
+
+
 class StickerLLMMixin(StickerBaseMixin):
     """Sticker LLM hook 逻辑"""
 
-    _DEFAULT_PROMPT_INJECTION_MODE = "on"
-    _SUPPORTED_PROMPT_INJECTION_MODES = {"on", "off"}
-    _PROMPT_INJECTION_MODE_ALIASES = {
-        "on": "on",
-        "enable": "on",
-        "enabled": "on",
-        "true": "on",
-        "1": "on",
-        "yes": "on",
-        "inject": "on",
-        "injection": "on",
-        "runtime": "on",
-        "prompt": "on",
-        "hybrid": "on",
-        "both": "on",
-        "off": "off",
-        "disable": "off",
-        "disabled": "off",
-        "false": "off",
-        "0": "off",
-        "no": "off",
-        "fc": "off",
-        "tool": "off",
-        "tools": "off",
-    }
+    _LOCAL_PATH_EXISTS_TTL_SECONDS = 5.0
 
     @staticmethod
     def _parse_bool_like_config(value: object, default: bool = False) -> bool:
@@ -71,12 +111,8 @@ class StickerLLMMixin(StickerBaseMixin):
             return value
         if value is None:
             return default
-        raw = str(value).strip().lower()
-        if raw in {"1", "true", "yes", "on", "enable", "enabled"}:
-            return True
-        if raw in {"0", "false", "no", "off", "disable", "disabled"}:
-            return False
-        return default
+        parsed = _coerce_bool_string(str(value))
+        return default if parsed is None else parsed
 
     def _get_reply_event_id(self, event: AstrMessageEvent) -> str | None:
         message_obj = getattr(event, "message_obj", None)
@@ -96,14 +132,14 @@ class StickerLLMMixin(StickerBaseMixin):
         return ""
 
     def _is_full_intercept_enabled(self) -> bool:
-        config = getattr(self, "config", None) or {}
+        config = self._cfg
         return self._parse_bool_like_config(
             config.get("matrix_sticker_full_intercept", False),
             False,
         )
 
     def _is_shortcode_strict_mode(self) -> bool:
-        config = getattr(self, "config", None) or {}
+        config = self._cfg
         if "emoji_shortcodes_strict_mode" in config:
             return self._parse_bool_like_config(
                 config.get("emoji_shortcodes_strict_mode"),
@@ -120,7 +156,7 @@ class StickerLLMMixin(StickerBaseMixin):
         )
 
     def _is_emoji_shortcodes_enabled(self) -> bool:
-        config = getattr(self, "config", None) or {}
+        config = self._cfg
         if "emoji_shortcodes" in config:
             return self._parse_bool_like_config(config.get("emoji_shortcodes"), False)
         if "matrix_sticker_emoji_shortcodes" in config:
@@ -133,17 +169,13 @@ class StickerLLMMixin(StickerBaseMixin):
         )
 
     def _normalize_prompt_injection_mode(self, mode: str | None) -> str:
-        raw = str(mode or "").strip().lower()
-        normalized = self._PROMPT_INJECTION_MODE_ALIASES.get(raw, raw)
-        if normalized in self._SUPPORTED_PROMPT_INJECTION_MODES:
-            return normalized
-        return self._DEFAULT_PROMPT_INJECTION_MODE
+        return _normalize_prompt_injection_mode_cached(str(mode or ""))
 
     def _get_prompt_injection_mode(self) -> str:
-        config = getattr(self, "config", None) or {}
+        config = self._cfg
         prompt_injection = config.get("matrix_sticker_prompt_injection")
         if prompt_injection is None:
-            return self._DEFAULT_PROMPT_INJECTION_MODE
+            return _DEFAULT_PROMPT_INJECTION_MODE
         if isinstance(prompt_injection, bool):
             return "on" if prompt_injection else "off"
         return self._normalize_prompt_injection_mode(prompt_injection)
@@ -152,7 +184,7 @@ class StickerLLMMixin(StickerBaseMixin):
         return self._get_prompt_injection_mode() == "on"
 
     def _is_other_platforms_extension_enabled(self) -> bool:
-        config = getattr(self, "config", None) or {}
+        config = self._cfg
         if "matrix_sticker_cross_platform" in config:
             return self._parse_bool_like_config(
                 config.get("matrix_sticker_cross_platform"),
@@ -163,26 +195,43 @@ class StickerLLMMixin(StickerBaseMixin):
             False,
         )
 
-    def _get_shortcode_pattern(self) -> re.Pattern[str]:
-        if self._is_shortcode_strict_mode():
+    def _snapshot_flags(self) -> _ResolvedFlags:
+        return _ResolvedFlags(
+            runtime_injection=self._is_runtime_injection_enabled(),
+            full_intercept=self._is_full_intercept_enabled(),
+            strict=self._is_shortcode_strict_mode(),
+            emoji=self._is_emoji_shortcodes_enabled(),
+            cross_platform=self._is_other_platforms_extension_enabled(),
+        )
+
+    def _get_shortcode_pattern(self, strict: bool | None = None) -> re.Pattern[str]:
+        if strict is None:
+            strict = self._is_shortcode_strict_mode()
+        if strict:
             return STRICT_SHORTCODE_PATTERN
         return RELAXED_SHORTCODE_PATTERN
 
     def _resolve_shortcode_sticker_map(self, shortcodes: list[str]) -> dict[str, Any]:
         resolved: dict[str, Any] = {}
         for shortcode in shortcodes:
-            shortcode_norm = str(shortcode or "").strip().lower()
+            shortcode_norm = shortcode.lower()
             if not shortcode_norm or shortcode_norm in resolved:
                 continue
             try:
-                resolved[shortcode_norm] = self._find_sticker_by_shortcode(shortcode)
+                resolved[shortcode_norm] = self._find_sticker_by_shortcode_cached(
+                    shortcode
+                )
             except Exception as e:
                 logger.debug(f"查找短码 '{shortcode_norm}' 失败：{e}")
                 resolved[shortcode_norm] = None
         return resolved
 
-    def _convert_emoji_shortcodes_in_chain(self, chain: list) -> tuple[list, bool]:
-        if not self._is_emoji_shortcodes_enabled():
+    def _convert_emoji_shortcodes_in_chain(
+        self, chain: list, enabled: bool | None = None
+    ) -> tuple[list, bool]:
+        if enabled is None:
+            enabled = self._is_emoji_shortcodes_enabled()
+        if not enabled:
             return chain, False
 
         converted_chain = []
@@ -205,9 +254,11 @@ class StickerLLMMixin(StickerBaseMixin):
                 converted_chain.append(component)
         return converted_chain, modified
 
-    def _convert_emoji_shortcodes_in_result(self, result) -> None:
+    def _convert_emoji_shortcodes_in_result(
+        self, result, enabled: bool | None = None
+    ) -> None:
         converted_chain, emoji_modified = self._convert_emoji_shortcodes_in_chain(
-            result.chain
+            result.chain, enabled
         )
         if emoji_modified:
             result.chain = converted_chain
@@ -232,10 +283,25 @@ class StickerLLMMixin(StickerBaseMixin):
                 meta = index.get(sticker_id)
 
         local_path = getattr(meta, "local_path", None) if meta else None
-        if local_path and Path(local_path).exists():
+        if local_path and self._local_path_exists(str(local_path)):
             return str(local_path)
         return None
 
+    def _local_path_exists(self, path: str) -> bool:
+        """短时缓存文件存在的结果；文件可能被外部删除，不存在的结果不缓存"""
+        cache = getattr(self, "_local_path_exists_cache", None)
+        if cache is None:
+            cache = self._local_path_exists_cache = {}
+        now = time.monotonic()
+        expires_at = cache.get(path)
+        if expires_at is not None and now < expires_at:
+            return True
+        if Path(path).exists():
+            cache[path] = now + self._LOCAL_PATH_EXISTS_TTL_SECONDS
+            return True
+        cache.pop(path, None)
+        return False
+
     def _resolve_matrix_download_client(self, event: AstrMessageEvent | None = None):
         matrix_client_getter = getattr(self, "_get_matrix_client", None)
         if event is not None and callable(matrix_client_getter):
@@ -274,7 +340,9 @@ class StickerLLMMixin(StickerBaseMixin):
                 fallback_source = str(getattr(sticker, "body", "") or "").strip()
             if not fallback_source:
                 return None
-            stable_id = hashlib.sha256(fallback_source.encode("utf-8")).hexdigest()
+            stable_id = hashlib.blake2b(
+                fallback_source.encode("utf-8"), digest_size=16
+            ).hexdigest()
         return f"matrix_sticker:tg:image:{stable_id}"
 
     @staticmethod
@@ -282,11 +350,13 @@ class StickerLLMMixin(StickerBaseMixin):
         image: Image,
         sticker,
         event: AstrMessageEvent | None,
+        platform_name: str | None = None,
     ) -> None:
-        if event is None:
-            return
-        platform_name = str(getattr(event, "get_platform_name", lambda: "")() or "")
-        if platform_name.strip().lower() != "telegram":
+        if platform_name is None:
+            if event is None:
+                return
+            platform_name = StickerLLMMixin._get_event_platform_name(event)
+        if platform_name != "telegram":
             return
         file_unique = StickerLLMMixin._build_telegram_sticker_cache_key(sticker)
         if file_unique:
@@ -296,12 +366,13 @@ class StickerLLMMixin(StickerBaseMixin):
         self,
         sticker,
         event: AstrMessageEvent | None = None,
+        platform_name: str | None = None,
     ) -> Image | None:
         try:
             local_path = self._resolve_sticker_local_path(sticker)
             if local_path:
                 image = Image.fromFileSystem(local_path)
-                self._attach_telegram_file_unique(image, sticker, event)
+                self._attach_telegram_file_unique(image, sticker, event, platform_name)
                 return image
 
             sticker_url = str(getattr(sticker, "url", "") or "")
@@ -343,14 +414,42 @@ class StickerLLMMixin(StickerBaseMixin):
             else:
                 image = Image(file=sticker_url)
 
-            self._attach_telegram_file_unique(image, sticker, event)
+            self._attach_telegram_file_unique(image, sticker, event, platform_name)
             return image
         except Exception as e:
             logger.debug(f"Convert sticker to image failed: {e}")
             return None
 
+    async def _build_image_components_for_stickers(
+        self,
+        stickers,
+        event: AstrMessageEvent | None = None,
+        platform_name: str | None = None,
+    ) -> dict[str, Image | None]:
+        """按 sticker 去重后并发转换为图片组件"""
+        unique_stickers: dict[str, Any] = {}
+        for sticker in stickers:
+            if not sticker:
+                continue
+            sticker_id = getattr(sticker, "sticker_id", None) or sticker.body
+            unique_stickers.setdefault(sticker_id, sticker)
+        if not unique_stickers:
+            return {}
+
+        results = await asyncio.gather(
+            *(
+                self._build_image_component_from_sticker(sticker, event, platform_name)
+                for sticker in unique_stickers.values()
+            ),
+            return_exceptions=True,
+        )
+        return {
+            sticker_id: None if isinstance(image, BaseException) else image
+            for sticker_id, image in zip(unique_stickers, results)
+        }
+
     def _get_max_stickers_per_reply(self) -> int | None:
-        config = getattr(self, "config", None) or {}
+        config = self._cfg
         value = config.get("matrix_sticker_max_per_reply", 5)
         try:
             value = int(value)
@@ -361,7 +460,7 @@ class StickerLLMMixin(StickerBaseMixin):
         return value
 
     def _get_prompt_sticker_limit(self) -> int:
-        config = getattr(self, "config", None) or {}
+        config = self._cfg
         value = config.get("matrix_sticker_prompt_limit", 50)
         try:
             value = int(value)
@@ -386,21 +485,21 @@ class StickerLLMMixin(StickerBaseMixin):
             logger.debug("没有消息结果或消息链为空")
             return
 
-        if not self._is_runtime_injection_enabled():
-            self._convert_emoji_shortcodes_in_result(result)
+        flags = self._snapshot_flags()
+        if not flags.runtime_injection:
+            self._convert_emoji_shortcodes_in_result(result, flags.emoji)
             return
 
         platform_name = self._get_event_platform_name(event)
         is_matrix_platform = platform_name == "matrix"
-        extension_enabled = self._is_other_platforms_extension_enabled()
 
-        if not is_matrix_platform and not extension_enabled:
-            self._convert_emoji_shortcodes_in_result(result)
+        if not is_matrix_platform and not flags.cross_platform:
+            self._convert_emoji_shortcodes_in_result(result, flags.emoji)
             return
 
         if not self._ensure_storage():
             logger.debug("Sticker storage 未初始化，跳过 sticker 短码替换")
-            self._convert_emoji_shortcodes_in_result(result)
+            self._convert_emoji_shortcodes_in_result(result, flags.emoji)
             return
 
         result_type = getattr(result, "result_content_type", None)
@@ -409,31 +508,37 @@ class StickerLLMMixin(StickerBaseMixin):
             f"处理消息，result_content_type={result_type}, is_streaming={is_streaming}"
         )
 
-        full_text = ""
-        for component in result.chain:
-            if isinstance(component, Plain):
-                full_text += component.text
+        plain_texts = [
+            component.text for component in result.chain if isinstance(component, Plain)
+        ]
+        full_text = "".join(plain_texts)
+        # 只有一个 Plain 组件时，其匹配结果与 full_text 完全一致，可直接复用
+        single_plain = len(plain_texts) == 1
 
         if not full_text:
             cached_text = event.get_extra("_sticker_llm_completion", "")
             if cached_text:
                 result.chain = [Plain(cached_text)]
                 full_text = cached_text
+                single_plain = True
+
+        if ":" not in full_text:
+            self._convert_emoji_shortcodes_in_result(result, flags.emoji)
+            return
 
-        shortcode_pattern = self._get_shortcode_pattern()
+        shortcode_pattern = self._get_shortcode_pattern(flags.strict)
         all_matches = list(shortcode_pattern.finditer(full_text))
-        resolved_shortcodes = self._resolve_shortcode_sticker_map(
-            [match.group(1) for match in all_matches]
-        )
+        matched_shortcodes = [match.group(1) for match in all_matches]
+        resolved_shortcodes = self._resolve_shortcode_sticker_map(matched_shortcodes)
         logger.debug(
-            f"在文本中找到 {len(all_matches)} 个短码匹配：{[m.group(1) for m in all_matches]}"
+            f"在文本中找到 {len(all_matches)} 个短码匹配：{matched_shortcodes}"
         )
 
-        if is_matrix_platform and self._is_full_intercept_enabled() and all_matches:
+        if is_matrix_platform and flags.full_intercept and all_matches:
             missing_shortcodes = []
             for match in all_matches:
                 shortcode = match.group(1)
-                shortcode_norm = shortcode.strip().lower()
+                shortcode_norm = shortcode.lower()
                 if not resolved_shortcodes.get(shortcode_norm):
                     missing_shortcodes.append(shortcode)
             if not missing_shortcodes:
@@ -442,6 +547,7 @@ class StickerLLMMixin(StickerBaseMixin):
                     full_text,
                     is_streaming,
                     resolved_shortcodes,
+                    all_matches,
                 )
                 if result:
                     result.chain = []
@@ -454,88 +560,85 @@ class StickerLLMMixin(StickerBaseMixin):
         marked_usage_ids: set[str] = set()
         new_chain = []
         modified = False
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        image_components: dict[str, Image | None] = {}
+        if not is_matrix_platform:
+            image_components = await self._build_image_components_for_stickers(
+                resolved_shortcodes.values(),
+                event,
+                platform_name,
+            )
 
         for component in result.chain:
-            if isinstance(component, Plain):
-                text = component.text
-                matches = list(shortcode_pattern.finditer(text))
-
-                if not matches:
-                    new_chain.append(component)
-                    continue
+            if not isinstance(component, Plain):
+                new_chain.append(component)
+                continue
 
-                last_end = 0
-                component_modified = False
-                for match in matches:
-                    shortcode = match.group(1)
-                    shortcode_norm = shortcode.strip().lower()
+            text = component.text
+            text_buf: list[str] = []
+            last_end = 0
+            matches = all_matches if single_plain else shortcode_pattern.finditer(text)
+            for match in matches:
+                shortcode = match.group(1)
+                shortcode_norm = shortcode.lower()
 
-                    sticker = resolved_shortcodes.get(shortcode_norm)
+                sticker = resolved_shortcodes.get(shortcode_norm)
+                if debug_enabled:
                     logger.debug(
-                        f"查找短码 '{shortcode}': {'找到' if sticker else '未找到'}"
+                        f"查找短码 '{shortcode_norm}': {'找到' if sticker else '未找到'}"
                     )
 
-                    if not sticker:
-                        continue
+                if not sticker:
+                    continue
 
-                    sticker_id = getattr(sticker, "sticker_id", None) or sticker.body
-                    replacement_component = sticker
-                    if not is_matrix_platform:
-                        replacement_component = (
-                            await self._build_image_component_from_sticker(
-                                sticker,
-                                event,
-                            )
-                        )
-                        if replacement_component is None:
+                sticker_id = getattr(sticker, "sticker_id", None) or sticker.body
+                replacement_component = sticker
+                if not is_matrix_platform:
+                    replacement_component = image_components.get(sticker_id)
+                    if replacement_component is None:
+                        if debug_enabled:
                             logger.debug(
-                                f"无法将短码 '{shortcode}' 对应 sticker 转为图片组件"
+                                f"无法将短码 '{shortcode_norm}' 对应 sticker 转为图片组件"
                             )
-                            continue
-
-                    if match.start() > last_end:
-                        before_text = text[last_end : match.start()]
-                        if before_text:
-                            new_chain.append(Plain(before_text))
-
-                    within_limit = (
-                        max_stickers is None
-                        or sticker_id in found_stickers
-                        or len(found_stickers) < max_stickers
-                    )
-
-                    if within_limit:
-                        if is_streaming and is_matrix_platform:
-                            if sticker_id not in found_stickers:
-                                found_stickers[sticker_id] = sticker
-                        else:
-                            if sticker_id not in found_stickers:
-                                new_chain.append(replacement_component)
-                                found_stickers[sticker_id] = replacement_component
-                                usage_id = str(
-                                    getattr(sticker, "sticker_id", "") or sticker_id
-                                )
-                                if usage_id and usage_id not in marked_usage_ids:
-                                    self._mark_sticker_used(sticker)
-                                    marked_usage_ids.add(usage_id)
-                        modified = True
-                        component_modified = True
-                    else:
-                        new_chain.append(Plain(text[match.start() : match.end()]))
-                        component_modified = True
+                        continue
 
+                within_limit = (
+                    max_stickers is None
+                    or sticker_id in found_stickers
+                    or len(found_stickers) < max_stickers
+                )
+                if not within_limit:
+                    text_buf.append(text[last_end : match.end()])
                     last_end = match.end()
+                    continue
 
-                if last_end < len(text):
-                    remaining_text = text[last_end:]
-                    if remaining_text:
-                        new_chain.append(Plain(remaining_text))
-                        component_modified = True
+                text_buf.append(text[last_end : match.start()])
+                last_end = match.end()
+                modified = True
+                if sticker_id in found_stickers:
+                    continue
+                if is_streaming and is_matrix_platform:
+                    found_stickers[sticker_id] = sticker
+                    continue
 
-                if not component_modified:
-                    new_chain.append(component)
-            else:
+                pending_text = "".join(text_buf)
+                if pending_text:
+                    new_chain.append(Plain(pending_text))
+                text_buf.clear()
+                new_chain.append(replacement_component)
+                found_stickers[sticker_id] = replacement_component
+                usage_id = str(getattr(sticker, "sticker_id", "") or sticker_id)
+                if usage_id and usage_id not in marked_usage_ids:
+                    self._mark_sticker_used(sticker)
+                    marked_usage_ids.add(usage_id)
+
+            if last_end == 0:
                 new_chain.append(component)
+                continue
+            text_buf.append(text[last_end:])
+            pending_text = "".join(text_buf)
+            if pending_text:
+                new_chain.append(Plain(pending_text))
 
         logger.debug(
             f"处理完成：modified={modified}, found_stickers={len(found_stickers)}"
@@ -548,27 +651,43 @@ class StickerLLMMixin(StickerBaseMixin):
                 logger.info(
                     f"流式输出完成，发送 {len(unique_stickers)} 个去重后的 sticker"
                 )
-                for i, sticker in enumerate(unique_stickers):
-                    try:
-                        logger.info(
-                            f"发送 sticker {i + 1}/{len(unique_stickers)}: {sticker.body if hasattr(sticker, 'body') else sticker}"
+                await asyncio.gather(
+                    *(
+                        self._send_sticker_message(
+                            event, sticker, reply_id, i + 1, len(unique_stickers)
                         )
-                        chain_comps = []
-                        if reply_id:
-                            chain_comps.append(Reply(id=reply_id))
-                        chain_comps.append(sticker)
-                        chain = MessageChain(chain_comps)
-                        logger.info(f"创建 MessageChain: {chain}")
-                        send_result = await event.send(chain)
-                        logger.info(f"发送结果：{send_result}")
-                        self._mark_sticker_used(sticker)
-                    except Exception as e:
-                        logger.error(f"发送 sticker 失败：{e}", exc_info=True)
+                        for i, sticker in enumerate(unique_stickers)
+                    )
+                )
             else:
                 result.chain = new_chain
                 logger.debug("已替换消息中的 sticker 短码")
 
-        self._convert_emoji_shortcodes_in_result(result)
+        self._convert_emoji_shortcodes_in_result(result, flags.emoji)
+
+    async def _send_sticker_message(
+        self,
+        event: AstrMessageEvent,
+        sticker,
+        reply_id: str | None,
+        index: int,
+        total: int,
+    ) -> None:
+        try:
+            logger.info(
+                f"发送 sticker {index}/{total}: {sticker.body if hasattr(sticker, 'body') else sticker}"
+            )
+            chain_comps = []
+            if reply_id:
+                chain_comps.append(Reply(id=reply_id))
+            chain_comps.append(sticker)
+            chain = MessageChain(chain_comps)
+            logger.info(f"创建 MessageChain: {chain}")
+            send_result = await event.send(chain)
+            logger.info(f"发送结果：{send_result}")
+            self._mark_sticker_used(sticker)
+        except Exception as e:
+            logger.error(f"发送 sticker 失败：{e}", exc_info=True)
 
     async def _send_split_messages(
         self,
@@ -576,6 +695,7 @@ class StickerLLMMixin(StickerBaseMixin):
         full_text: str,
         is_streaming: bool,
         resolved_shortcodes: dict[str, Any] | None = None,
+        matches: list[re.Match[str]] | None = None,
     ) -> None:
         max_stickers = self._get_max_stickers_per_reply()
         found_stickers: dict[str, Any] = {}
@@ -583,19 +703,20 @@ class StickerLLMMixin(StickerBaseMixin):
         reply_id = self._get_reply_event_id(event)
 
         last_end = 0
-        shortcode_pattern = self._get_shortcode_pattern()
+        if matches is None:
+            matches = list(self._get_shortcode_pattern().finditer(full_text))
         if resolved_shortcodes is None:
             resolved_shortcodes = self._resolve_shortcode_sticker_map(
-                [match.group(1) for match in shortcode_pattern.finditer(full_text)]
+                [match.group(1) for match in matches]
             )
-        for match in shortcode_pattern.finditer(full_text):
+        for match in matches:
             if match.start() > last_end:
                 before_text = full_text[last_end : match.start()]
                 if before_text:
                     segments.append(Plain(before_text))
 
             shortcode = match.group(1)
-            sticker = resolved_shortcodes.get(shortcode.strip().lower())
+            sticker = resolved_shortcodes.get(shortcode.lower())
             if sticker:
                 sticker_id = getattr(sticker, "sticker_id", None) or sticker.body
                 within_limit = (
@@ -608,9 +729,9 @@ class StickerLLMMixin(StickerBaseMixin):
                         found_stickers[sticker_id] = sticker
                     segments.append(sticker)
                 else:
-                    segments.append(Plain(full_text[match.start() : match.end()]))
+                    segments.append(Plain(match.group(0)))
             else:
-                segments.append(Plain(full_text[match.start() : match.end()]))
+                segments.append(Plain(match.group(0)))
 
             last_end = match.end()
 
@@ -637,45 +758,56 @@ class StickerLLMMixin(StickerBaseMixin):
                     continue
                 break
 
+    def _get_cached_sticker_prompt(self) -> tuple[str, int] | None:
+        """按索引版本和数量上限复用已拼接的提示词，返回 (提示词, sticker 数)"""
+        limit = self._get_prompt_sticker_limit()
+        key = (getattr(self, "_storage_index_version", 0), limit)
+        cached = getattr(self, "_prompt_cache", None)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        try:
+            stickers = self._storage.list_stickers(limit=limit)
+        except Exception as e:
+            logger.debug(f"读取 sticker 列表失败，跳过提示词注入：{e}")
+            return None
+
+        entry: tuple[str, int] | None = None
+        if stickers:
+            sticker_prompt = STICKER_PROMPT_TEMPLATE.format(
+                sticker_list="\n".join(
+                    f"- :{meta.body}:"
+                    + (f" ({meta.pack_name})" if meta.pack_name else "")
+                    for meta in stickers
+                )
+            )
+            entry = (sticker_prompt, len(stickers))
+        self._prompt_cache = (key, entry)
+        return entry
+
     def hook_inject_sticker_prompt(self, event: AstrMessageEvent, req: ProviderRequest):
         """Inject available sticker shortcodes into LLM prompt."""
-        if not self._is_runtime_injection_enabled():
+        flags = self._snapshot_flags()
+        if not flags.runtime_injection:
             return
 
         platform_name = self._get_event_platform_name(event)
         is_matrix_platform = platform_name == "matrix"
-        if not is_matrix_platform and not self._is_other_platforms_extension_enabled():
+        if not is_matrix_platform and not flags.cross_platform:
             return
-        if is_matrix_platform and self._is_full_intercept_enabled():
+        if is_matrix_platform and flags.full_intercept:
             event.set_extra("enable_streaming", False)
         if not self._ensure_storage():
             return
 
-        try:
-            stickers = self._storage.list_stickers(
-                limit=self._get_prompt_sticker_limit()
-            )
-        except Exception as e:
-            logger.debug(f"读取 sticker 列表失败，跳过提示词注入：{e}")
+        cached_prompt = self._get_cached_sticker_prompt()
+        if cached_prompt is None:
             return
-        if not stickers:
-            return
-
-        shortcode_list = []
-        for meta in stickers:
-            pack_info = f" ({meta.pack_name})" if meta.pack_name else ""
-            shortcode_list.append(f"- :{meta.body}:{pack_info}")
-
-        if not shortcode_list:
-            return
-
-        sticker_prompt = STICKER_PROMPT_TEMPLATE.format(
-            sticker_list="\n".join(shortcode_list)
-        )
+        sticker_prompt, sticker_count = cached_prompt
 
         if req.system_prompt:
             req.system_prompt = req.system_prompt + "\n\n" + sticker_prompt
         else:
             req.system_prompt = sticker_prompt
 
-        logger.debug(f"已注入 {len(shortcode_list)} 个 sticker 短码到 LLM 提示词")
+        logger.debug(f"已注入 {sticker_count} 个 sticker 短码到 LLM 提示词")
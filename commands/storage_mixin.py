@@ -2,11 +2,15 @@
 Matrix sticker storage mixin - 存储和基础命令
 """
 
+import asyncio
+import bisect
 import importlib
 import math
 import re
 import sys
 import time
+from collections import Counter, OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Any
@@ -21,6 +25,30 @@ from astrbot.core.utils.astrbot_path import get_astrbot_data_path
 from ..vector_index import StickerVectorDocument, StickerVectorIndex
 from ..vertex_multimodal_embedding import VertexMultimodalEmbeddingProvider
 
+_MATRIX_ADAPTER_PACKAGE = "astrbot_plugin_matrix_adapter"
+_PLUGINS_DIR = str(Path(__file__).parent.parent.parent)
+_plugins_dir_registered = False
+
+
+def _import_matrix_adapter_module(module_name: str):
+    """导入 matrix adapter 子模块，插件目录只会加入 sys.path 一次。"""
+    global _plugins_dir_registered
+    qualified_name = f"{_MATRIX_ADAPTER_PACKAGE}.{module_name}"
+    module = sys.modules.get(qualified_name)
+    if module is not None:
+        return module
+    if not _plugins_dir_registered:
+        if _PLUGINS_DIR not in sys.path:
+            sys.path.insert(0, _PLUGINS_DIR)
+        _plugins_dir_registered = True
+    return importlib.import_module(qualified_name)
+
+
+@lru_cache(maxsize=32768)
+def _normalize_shortcode_text(value: str) -> str:
+    """缓存 body/别名的归一化结果，索引重建时复用同一批字符串。"""
+    return value.strip().casefold()
+
 
 class StickerStorageMixin:
     """Sticker 基础功能：初始化、存储、查找、向量检索等"""
@@ -29,19 +57,20 @@ class StickerStorageMixin:
     _DEFAULT_VECTOR_TOP_K = 10
     _DEFAULT_VECTOR_FETCH_K = 50
     _DEFAULT_VECTOR_SIMILARITY_THRESHOLD = 0.35
+    _INDEX_FLUSH_DELAY_SECONDS = 0.5
+    _SHORTCODE_RESOLUTION_CACHE_SIZE = 256
+
+    @property
+    def _cfg(self) -> dict:
+        """插件配置，未设置时返回空字典"""
+        return getattr(self, "config", None) or {}
 
     def _get_matrix_utils_cls(self):
         if self._matrix_utils_cls is not None:
             return self._matrix_utils_cls
 
-        plugins_dir = Path(__file__).parent.parent.parent
-        if str(plugins_dir) not in sys.path:
-            sys.path.insert(0, str(plugins_dir))
-
         try:
-            utils_module = importlib.import_module(
-                "astrbot_plugin_matrix_adapter.utils"
-            )
+            utils_module = _import_matrix_adapter_module("utils")
         except ImportError as e:
             logger.debug(f"无法导入 MatrixUtils：{e}")
             return None
@@ -57,13 +86,7 @@ class StickerStorageMixin:
     def _init_sticker_module(self):
         """初始化 sticker 模块（从 matrix adapter 导入）"""
         try:
-            plugins_dir = Path(__file__).parent.parent.parent
-            if str(plugins_dir) not in sys.path:
-                sys.path.insert(0, str(plugins_dir))
-
-            sticker_module = importlib.import_module(
-                "astrbot_plugin_matrix_adapter.sticker"
-            )
+            sticker_module = _import_matrix_adapter_module("sticker")
             self._storage = sticker_module.StickerStorage()
             self._Sticker = sticker_module.Sticker
             self._StickerInfo = sticker_module.StickerInfo
@@ -101,11 +124,61 @@ class StickerStorageMixin:
         except (TypeError, ValueError):
             return 3.0
 
-    def _invalidate_sticker_lookup_cache(self) -> None:
+    def _invalidate_shortcode_cache(self) -> None:
+        self._shortcode_resolution_cache = None
+        self._local_path_exists_cache = {}
+        self._storage_index_version = getattr(self, "_storage_index_version", 0) + 1
+
+    def _invalidate_sticker_lookup_cache(self, reload_storage: bool = True) -> None:
         self._shortcode_lookup_cache = None
-        self._last_storage_reload_monotonic = 0.0
+        self._invalidate_shortcode_cache()
+        self._sticker_meta_id_index = None
+        self._sorted_sticker_ids = None
+        if reload_storage:
+            self._last_storage_reload_monotonic = 0.0
         self._mark_vector_index_dirty()
 
+    def _schedule_index_flush(self) -> None:
+        """标记索引待写入，并在短暂空闲后合并写盘。"""
+        self._index_dirty = True
+        task = getattr(self, "_index_flush_task", None)
+        if task is not None and not task.done():
+            task.cancel()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._flush_pending_index_save()
+            return
+        self._index_flush_task = loop.create_task(
+            self._flush_index_after_delay(),
+            name="matrix-sticker-index-flush",
+        )
+
+    async def _flush_index_after_delay(self) -> None:
+        await asyncio.sleep(self._INDEX_FLUSH_DELAY_SECONDS)
+        self._flush_pending_index_save()
+
+    def _flush_pending_index_save(self) -> None:
+        task = getattr(self, "_index_flush_task", None)
+        self._index_flush_task = None
+        if task is not None and not task.done():
+            try:
+                current_task = asyncio.current_task()
+            except RuntimeError:
+                current_task = None
+            if task is not current_task:
+                task.cancel()
+        if not getattr(self, "_index_dirty", False) or self._storage is None:
+            return
+        self._index_dirty = False
+        try:
+            self._storage.save_index()
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"写入 sticker 索引失败：{e}")
+            return
+        # 记录本进程写入后的 mtime，避免下次检查时把刚写入的索引当作外部修改重新加载
+        self._storage_index_mtime_ns = self._get_storage_index_mtime_ns()
+
     def _mark_vector_index_dirty(self) -> None:
         setattr(self, "_vector_index_dirty", True)
 
@@ -115,6 +188,20 @@ class StickerStorageMixin:
     def _is_vector_index_dirty(self) -> bool:
         return bool(getattr(self, "_vector_index_dirty", True))
 
+    def _get_storage_index_mtime_ns(self) -> int | None:
+        """返回存储索引文件的 mtime，无法确定索引文件时返回 None。"""
+        if self._storage is None:
+            return None
+        for attr in ("index_path", "_index_path", "index_file", "_index_file"):
+            index_path = getattr(self._storage, attr, None)
+            if not index_path:
+                continue
+            try:
+                return Path(index_path).stat().st_mtime_ns
+            except (OSError, TypeError, ValueError):
+                return None
+        return None
+
     def _maybe_refresh_storage_index(self, force: bool = False) -> bool:
         if self._storage is None:
             return False
@@ -124,6 +211,16 @@ class StickerStorageMixin:
         should_reload = force or interval <= 0.0 or (now - last_reload) >= interval
         if not should_reload:
             return False
+        self._flush_pending_index_save()
+        index_mtime_ns = self._get_storage_index_mtime_ns()
+        if (
+            not force
+            and interval > 0.0
+            and index_mtime_ns is not None
+            and index_mtime_ns == getattr(self, "_storage_index_mtime_ns", None)
+        ):
+            self._last_storage_reload_monotonic = now
+            return False
         try:
             if hasattr(self._storage, "reload_index"):
                 self._storage.reload_index()
@@ -133,27 +230,126 @@ class StickerStorageMixin:
             logger.debug(f"刷新 sticker 索引失败：{e}")
             return False
         self._last_storage_reload_monotonic = now
+        self._storage_index_mtime_ns = index_mtime_ns
         self._shortcode_lookup_cache = None
+        self._invalidate_shortcode_cache()
+        self._sticker_meta_id_index = None
+        self._sorted_sticker_ids = None
         self._mark_vector_index_dirty()
         return True
 
+    @staticmethod
+    def _normalize_shortcode_key(value: Any) -> str:
+        """短码查找键：去除首尾空白并做大小写折叠。"""
+        if isinstance(value, str):
+            return _normalize_shortcode_text(value)
+        return str(value or "").strip().casefold()
+
+    def _assign_shortcode_key(
+        self, lookup: dict[str, str], key: str, sticker_id: str, from_tag: bool
+    ) -> None:
+        """写入短码索引，同时维护 sticker_id -> 短码 的反向映射"""
+        owned_keys = getattr(self, "_shortcode_index_keys", None)
+        if owned_keys is None:
+            owned_keys = self._shortcode_index_keys = {}
+        tag_keys = getattr(self, "_shortcode_tag_keys", None)
+        if tag_keys is None:
+            tag_keys = self._shortcode_tag_keys = set()
+        previous = lookup.get(key)
+        if previous is not None and previous != sticker_id:
+            owned_keys.get(previous, set()).discard(key)
+        lookup[key] = sticker_id
+        owned_keys.setdefault(sticker_id, set()).add(key)
+        if from_tag:
+            tag_keys.add(key)
+        else:
+            tag_keys.discard(key)
+
     def _build_shortcode_lookup_cache(self) -> dict[str, str]:
+        self._shortcode_index_keys = {}
+        self._shortcode_tag_keys = set()
         if self._storage is None:
             return {}
         lookup: dict[str, str] = {}
+        tag_entries: list[tuple[str, str]] = []
         for meta in self._list_all_sticker_metas(max_limit=20000):
-            sticker_id = getattr(meta, "sticker_id", "")
-            body = str(getattr(meta, "body", "") or "").strip().lower()
-            if body and sticker_id and body not in lookup:
-                lookup[body] = sticker_id
-            raw_tags = getattr(meta, "tags", None) or []
-            for tag in raw_tags:
-                tag_norm = str(tag or "").strip().lower()
-                if tag_norm and sticker_id and tag_norm not in lookup:
-                    lookup[tag_norm] = sticker_id
+            # 存储返回的都是 Sticker 实例，直接取属性；形状不符时才退回 getattr
+            try:
+                sticker_id = meta.sticker_id
+                raw_body = meta.body
+                tags = meta.tags
+            except AttributeError:
+                sticker_id = getattr(meta, "sticker_id", "")
+                raw_body = getattr(meta, "body", "")
+                tags = getattr(meta, "tags", None)
+            if not sticker_id:
+                continue
+            body = self._normalize_shortcode_key(raw_body)
+            if body and body not in lookup:
+                self._assign_shortcode_key(lookup, body, sticker_id, from_tag=False)
+            for tag in tags or []:
+                tag_norm = self._normalize_shortcode_key(tag)
+                if tag_norm:
+                    tag_entries.append((tag_norm, sticker_id))
+        # body 优先于同名别名，与 find_stickers 回退路径的匹配顺序保持一致
+        for tag_norm, sticker_id in tag_entries:
+            if tag_norm not in lookup:
+                self._assign_shortcode_key(lookup, tag_norm, sticker_id, from_tag=True)
         return lookup
 
-    def _list_all_sticker_metas(self, max_limit: int = 20000) -> list:
+    def _shortcode_index_add(self, meta) -> None:
+        """保存新 sticker 后增量更新短码索引和 ID 索引，避免整表重建"""
+        sticker_id = str(getattr(meta, "sticker_id", "") or "")
+        if not sticker_id:
+            self._invalidate_sticker_lookup_cache()
+            return
+        owned_keys = getattr(self, "_shortcode_index_keys", None) or {}
+        index = getattr(self, "_sticker_meta_id_index", None)
+        if sticker_id in owned_keys or sticker_id in (index or {}):
+            # 覆盖已有 sticker 会让出其短码，被遮蔽的同名条目需按重建顺序重新归属
+            self._shortcode_index_remove(sticker_id)
+            return
+
+        lookup = getattr(self, "_shortcode_lookup_cache", None)
+        if lookup is not None:
+            tag_keys = getattr(self, "_shortcode_tag_keys", None) or set()
+            body = self._normalize_shortcode_key(getattr(meta, "body", ""))
+            if body and (body not in lookup or body in tag_keys):
+                self._assign_shortcode_key(lookup, body, sticker_id, from_tag=False)
+            for tag in getattr(meta, "tags", None) or []:
+                tag_norm = self._normalize_shortcode_key(tag)
+                if tag_norm and tag_norm not in lookup:
+                    self._assign_shortcode_key(
+                        lookup, tag_norm, sticker_id, from_tag=True
+                    )
+
+        if index is not None:
+            index[sticker_id] = meta
+        sorted_ids = getattr(self, "_sorted_sticker_ids", None)
+        if sorted_ids is not None:
+            bisect.insort(sorted_ids, sticker_id)
+        self._after_incremental_index_update()
+
+    def _shortcode_index_remove(self, sticker_id: str) -> None:
+        """删除或覆盖 sticker 后重建短码索引和 ID 索引
+
+        被删除条目遮蔽的同名短码要按整表重建时的顺序重新归属，删除又是少见的
+        管理操作，直接让内存索引失效，下次查找时重建。
+        """
+        self._invalidate_sticker_lookup_cache(reload_storage=False)
+        # 索引文件由本进程刚写入，记录新的 mtime，避免下次检查时重新加载
+        self._storage_index_mtime_ns = self._get_storage_index_mtime_ns()
+
+    def _after_incremental_index_update(self) -> None:
+        self._invalidate_shortcode_cache()
+        self._mark_vector_index_dirty()
+        # 索引文件由本进程刚写入，记录新的 mtime，避免下次检查时重新加载
+        self._storage_index_mtime_ns = self._get_storage_index_mtime_ns()
+
+    def _list_all_sticker_metas(
+        self, max_limit: int = 20000, cache_stats: bool = True
+    ) -> list:
+        """列出全部 sticker 元数据；在工作线程中调用时传 cache_stats=False，不写实例缓存"""
         if self._storage is None:
             return []
         iter_metas = getattr(self._storage, "iter_sticker_metas", None)
@@ -165,7 +361,7 @@ class StickerStorageMixin:
                 logger.debug(f"遍历 sticker 元数据失败：{e}")
         limit = 5000
         try:
-            stats = self._storage.get_stats()
+            stats = self._get_storage_stats(store=cache_stats)
             total_count = int(stats.get("total_count", 0))
             if total_count > 0:
                 limit = max(limit, total_count)
@@ -178,6 +374,83 @@ class StickerStorageMixin:
             logger.debug(f"读取 sticker 列表失败：{e}")
             return []
 
+    def _get_storage_stats(self, store: bool = True) -> dict[str, Any]:
+        """读取存储统计信息，按索引版本缓存，索引变化后自动失效"""
+        version = getattr(self, "_storage_index_version", 0)
+        cached = getattr(self, "_stats_cache", None)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        stats = self._storage.get_stats()
+        if store:
+            self._stats_cache = (version, stats)
+        return stats
+
+    def _build_sticker_meta_id_index(self, cache_stats: bool = True) -> dict[str, Any]:
+        index = {}
+        for meta in self._list_all_sticker_metas(
+            max_limit=20000, cache_stats=cache_stats
+        ):
+            sticker_id = str(getattr(meta, "sticker_id", "") or "")
+            if sticker_id and sticker_id not in index:
+                index[sticker_id] = meta
+        return index
+
+    def _get_sticker_meta_id_index(self) -> dict[str, Any]:
+        index = getattr(self, "_sticker_meta_id_index", None)
+        if index is not None:
+            return index
+        index = self._build_sticker_meta_id_index()
+        self._sticker_meta_id_index = index
+        return index
+
+    def _get_sorted_sticker_ids(self) -> list[str]:
+        sorted_ids = getattr(self, "_sorted_sticker_ids", None)
+        if sorted_ids is None:
+            sorted_ids = sorted(self._get_sticker_meta_id_index())
+            self._sorted_sticker_ids = sorted_ids
+        return sorted_ids
+
+    def _find_sticker_meta_by_prefix(self, sticker_id: str):
+        """根据完整 ID 或 ID 前缀查找 sticker 元数据"""
+        if self._storage is None:
+            return None
+        prefix = str(sticker_id or "")
+        if not prefix:
+            return None
+        index = self._get_sticker_meta_id_index()
+        meta = index.get(prefix)
+        if meta is not None:
+            return meta
+        sorted_ids = self._get_sorted_sticker_ids()
+        pos = bisect.bisect_left(sorted_ids, prefix)
+        if pos < len(sorted_ids) and sorted_ids[pos].startswith(prefix):
+            return index.get(sorted_ids[pos])
+        return None
+
+    async def _find_sticker_meta_by_prefix_async(self, sticker_id: str):
+        """异步版本：索引未缓存时在线程中构建，避免阻塞事件循环。"""
+        if self._storage is not None and (
+            getattr(self, "_sorted_sticker_ids", None) is None
+        ):
+            version = getattr(self, "_storage_index_version", 0)
+            cached_index = getattr(self, "_sticker_meta_id_index", None)
+            # 已有索引时先在事件循环中取键快照，工作线程不迭代可能被修改的 dict
+            cached_ids = list(cached_index) if cached_index is not None else None
+
+            def _build() -> tuple[dict[str, Any], list[str]]:
+                # 只构建局部结果，不在工作线程中写实例属性
+                if cached_index is not None:
+                    return cached_index, sorted(cached_ids)
+                index = self._build_sticker_meta_id_index(cache_stats=False)
+                return index, sorted(index)
+
+            index, sorted_ids = await asyncio.to_thread(_build)
+            # 等待期间索引可能已重新加载，此时丢弃旧的元数据对象，避免写回失效索引
+            if getattr(self, "_storage_index_version", 0) == version:
+                self._sticker_meta_id_index = index
+                self._sorted_sticker_ids = sorted_ids
+        return self._find_sticker_meta_by_prefix(sticker_id)
+
     def _get_sticker_meta(self, sticker_id: str):
         if self._storage is None:
             return None
@@ -187,10 +460,7 @@ class StickerStorageMixin:
                 return getter(sticker_id)
             except Exception as e:
                 logger.debug(f"读取 sticker 元数据失败：{e}")
-        for meta in self._list_all_sticker_metas(max_limit=20000):
-            if str(getattr(meta, "sticker_id", "") or "") == str(sticker_id or ""):
-                return meta
-        return None
+        return self._get_sticker_meta_id_index().get(str(sticker_id or ""))
 
     def _get_storage_sticker(self, sticker_id: str, update_usage: bool = True):
         if self._storage is None:
@@ -219,12 +489,25 @@ class StickerStorageMixin:
 
     def _find_sticker_by_shortcode(self, shortcode: str):
         """根据短码查找 sticker（支持 body 和别名）"""
+        return self._lookup_sticker_by_shortcode(shortcode)[0]
+
+    def _lookup_sticker_by_shortcode(
+        self,
+        shortcode: str,
+        update_usage: bool = False,
+        fallback_to_first: bool = False,
+    ) -> tuple[Any, bool]:
+        """短码查找的核心实现，返回 (sticker, 是否已记录使用)
+
+        fallback_to_first 为 True 时，若关键词检索结果中没有 body/别名完全匹配，
+        则返回第一个结果，避免调用方再做一次相同的检索。
+        """
         if self._storage is None:
-            return None
+            return None, False
 
-        shortcode_norm = str(shortcode or "").strip().lower()
+        shortcode_norm = self._normalize_shortcode_key(shortcode)
         if not shortcode_norm:
-            return None
+            return None, False
 
         lookup = getattr(self, "_shortcode_lookup_cache", None)
         if lookup is None:
@@ -233,28 +516,58 @@ class StickerStorageMixin:
 
         sticker_id = lookup.get(shortcode_norm)
         if sticker_id:
-            sticker = self._get_storage_sticker(sticker_id, update_usage=False)
+            sticker = self._get_storage_sticker(sticker_id, update_usage=update_usage)
             if sticker is not None:
-                return sticker
+                return sticker, update_usage
             lookup.pop(shortcode_norm, None)
 
+        body_hit = None
+        tag_hit = None
         results = self._storage.find_stickers(query=shortcode, limit=10)
         for sticker in results:
-            sticker_body = str(getattr(sticker, "body", "") or "").strip().lower()
+            sticker_body = self._normalize_shortcode_key(getattr(sticker, "body", ""))
             if sticker_body == shortcode_norm:
-                matched_id = getattr(sticker, "sticker_id", None)
-                if matched_id:
-                    lookup[shortcode_norm] = matched_id
-                return sticker
-            sticker_tags = getattr(sticker, "tags", None) or []
-            tags_norm = {str(tag or "").strip().lower() for tag in sticker_tags}
-            if shortcode_norm in tags_norm:
-                matched_id = getattr(sticker, "sticker_id", None)
-                if matched_id:
-                    lookup[shortcode_norm] = matched_id
-                return sticker
+                body_hit = sticker
+                break
+            if tag_hit is None and any(
+                self._normalize_shortcode_key(tag) == shortcode_norm
+                for tag in (getattr(sticker, "tags", None) or [])
+            ):
+                tag_hit = sticker
+
+        matched = body_hit or tag_hit
+        if matched is not None:
+            matched_id = getattr(matched, "sticker_id", None)
+            if matched_id:
+                self._assign_shortcode_key(
+                    lookup,
+                    shortcode_norm,
+                    matched_id,
+                    from_tag=matched is not body_hit,
+                )
+        elif fallback_to_first and results:
+            matched = results[0]
+        return matched, False
 
-        return None
+    def _find_sticker_by_shortcode_cached(self, shortcode: str):
+        """带 LRU 缓存的短码查找，未命中的短码同样缓存，存储变更时清空"""
+        shortcode_norm = self._normalize_shortcode_key(shortcode)
+        if not shortcode_norm:
+            return None
+
+        cache = getattr(self, "_shortcode_resolution_cache", None)
+        if cache is None:
+            cache = OrderedDict()
+            self._shortcode_resolution_cache = cache
+        elif shortcode_norm in cache:
+            cache.move_to_end(shortcode_norm)
+            return cache[shortcode_norm]
+
+        sticker = self._find_sticker_by_shortcode(shortcode)
+        cache[shortcode_norm] = sticker
+        if len(cache) > self._SHORTCODE_RESOLUTION_CACHE_SIZE:
+            cache.popitem(last=False)
+        return sticker
 
     def _get_sticker_shortcodes(self) -> list[str]:
         """获取所有可用的 sticker 短码"""
@@ -280,7 +593,7 @@ class StickerStorageMixin:
         return default
 
     def _get_vector_config(self) -> dict[str, Any]:
-        config = getattr(self, "config", None) or {}
+        config = self._cfg
         vector_config = config.get("matrix_sticker_vector", {})
         if isinstance(vector_config, dict):
             return vector_config
@@ -1229,34 +1542,46 @@ class StickerStorageMixin:
 
     async def cmd_list_stickers(self, pack_name: str | None = None) -> str:
         """列出 sticker"""
-        stickers = self._storage.list_stickers(pack_name=pack_name, limit=20)
+        stickers = await asyncio.to_thread(
+            self._storage.list_stickers, pack_name=pack_name, limit=20
+        )
 
         if not stickers:
             if pack_name:
                 return f"包 '{pack_name}' 中没有 sticker"
             return "没有保存的 sticker"
 
-        lines = ["已保存的 sticker："]
-        for meta in stickers:
-            pack_info = f" [{meta.pack_name}]" if meta.pack_name else ""
-            lines.append(f"  {meta.sticker_id[:8]}: {meta.body}{pack_info}")
+        lines = ["已保存的 sticker："] + [
+            f"  {meta.sticker_id[:8]}: {meta.body}"
+            + (f" [{meta.pack_name}]" if meta.pack_name else "")
+            for meta in stickers
+        ]
 
         if len(stickers) == 20:
             lines.append("  ... (显示前 20 个)")
 
         return "\n".join(lines)
 
-    def cmd_list_packs(self) -> str:
-        """列出所有包"""
+    def _collect_pack_counts(self) -> tuple[list[str], Counter]:
         packs = self._storage.list_packs()
+        if not packs:
+            return [], Counter()
+        counts = Counter(
+            getattr(meta, "pack_name", None)
+            for meta in self._list_all_sticker_metas(max_limit=20000, cache_stats=False)
+        )
+        return packs, counts
+
+    async def cmd_list_packs(self) -> str:
+        """列出所有包"""
+        packs, counts = await asyncio.to_thread(self._collect_pack_counts)
 
         if not packs:
             return "没有 sticker 包"
 
-        lines = ["Sticker 包列表："]
-        for pack in packs:
-            count = len(self._storage.list_stickers(pack_name=pack, limit=1000))
-            lines.append(f"  {pack}: {count} 个 sticker")
+        lines = ["Sticker 包列表："] + [
+            f"  {pack}: {counts.get(pack, 0)} 个 sticker" for pack in packs
+        ]
 
         return "\n".join(lines)
 
@@ -1303,7 +1628,7 @@ class StickerStorageMixin:
                 client=client,
                 pack_name=pack_name,
             )
-            self._invalidate_sticker_lookup_cache()
+            self._shortcode_index_add(meta)
             await self._maybe_auto_reconcile_vector_index()
             return f"已保存 sticker: {meta.sticker_id[:8]} ({name})"
         except Exception as e:
@@ -1315,17 +1640,13 @@ class StickerStorageMixin:
         sticker = self._get_storage_sticker(identifier, update_usage=True)
         usage_recorded = sticker is not None
 
-        if sticker is None:
-            sticker = self._find_sticker_by_shortcode(identifier)
-
         if sticker is None:
             try:
-                results = self._storage.find_stickers(query=identifier, limit=1)
+                sticker, usage_recorded = self._lookup_sticker_by_shortcode(
+                    identifier, update_usage=True, fallback_to_first=True
+                )
             except Exception as e:
                 logger.debug(f"按关键词查找 sticker 失败：{e}")
-                results = []
-            if results:
-                sticker = results[0]
 
         if sticker is None and self._is_vector_search_enabled():
             try:
@@ -1349,7 +1670,7 @@ class StickerStorageMixin:
     async def cmd_delete_sticker(self, sticker_id: str) -> str:
         """删除 sticker"""
         if self._storage.delete_sticker(sticker_id):
-            self._invalidate_sticker_lookup_cache()
+            self._shortcode_index_remove(sticker_id)
             await self._maybe_auto_reconcile_vector_index()
             return f"已删除 sticker: {sticker_id}"
         return f"未找到 sticker: {sticker_id}"
@@ -1386,7 +1707,7 @@ class StickerStorageMixin:
 
     def cmd_get_stats(self) -> str:
         """获取统计信息"""
-        stats = self._storage.get_stats()
+        stats = self._get_storage_stats()
         vector_status, _vector_error = self._get_vector_status_snapshot()
 
         lines = [
@@ -1488,13 +1809,32 @@ class StickerStorageMixin:
             logger.error(f"同步房间 sticker 失败：{e}")
             return f"同步失败：{e}"
 
+    def _invalidate_matrix_lookup_cache(self) -> None:
+        self._matrix_lookup_cache = None
+
+    def _get_cached_matrix_platform(self, platform_id: str, resolver):
+        """按平台 ID 缓存 Matrix 平台实例，平台加载或重载时由 on_platform_loaded 清空。"""
+        cache = getattr(self, "_matrix_lookup_cache", None)
+        if cache is None:
+            cache = {}
+            self._matrix_lookup_cache = cache
+        platform = cache.get(platform_id)
+        if platform is None:
+            platform = resolver()
+            if platform is not None:
+                cache[platform_id] = platform
+        return platform
+
     def _get_matrix_syncer(self, event: AstrMessageEvent):
         matrix_utils_cls = self._get_matrix_utils_cls()
         if matrix_utils_cls is None:
             return None
         try:
             platform_id = str(event.get_platform_id() or "")
-            platform = matrix_utils_cls.get_matrix_platform(self.context, platform_id)
+            platform = self._get_cached_matrix_platform(
+                platform_id,
+                lambda: matrix_utils_cls.get_matrix_platform(self.context, platform_id),
+            )
             if platform is None:
                 return None
             return getattr(platform, "sticker_syncer", None)
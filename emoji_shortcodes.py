@@ -149,6 +149,7 @@ _FALLBACK_EMOJI_SHORTCODES: dict[str, str] = {
 _EMOJI_SHORTCODES: dict[str, str] | None = None
 _SHORTCODE_CONVERSION_ENABLED = False
 _SHORTCODE_STRICT_MODE = False
+_ACTIVE_SHORTCODE_PATTERN = _RELAXED_SHORTCODE_PATTERN
 _SHORTCODE_CACHE_PATH: Path | None = None
 _HTTP_TIMEOUT_SECONDS = 10.0
 
@@ -178,12 +179,18 @@ def configure_emoji_shortcodes(
     """
     global _SHORTCODE_CONVERSION_ENABLED
     global _SHORTCODE_STRICT_MODE
+    global _ACTIVE_SHORTCODE_PATTERN
     global _SHORTCODE_CACHE_PATH
     global _EMOJI_SHORTCODES
     global _HTTP_TIMEOUT_SECONDS
 
     _SHORTCODE_CONVERSION_ENABLED = bool(enabled)
     _SHORTCODE_STRICT_MODE = bool(strict_mode)
+    _ACTIVE_SHORTCODE_PATTERN = (
+        _STRICT_SHORTCODE_PATTERN
+        if _SHORTCODE_STRICT_MODE
+        else _RELAXED_SHORTCODE_PATTERN
+    )
     _SHORTCODE_CACHE_PATH = Path(cache_path) if cache_path else _default_cache_path()
     _EMOJI_SHORTCODES = None
 
@@ -194,12 +201,6 @@ def configure_emoji_shortcodes(
     _HTTP_TIMEOUT_SECONDS = max(5.0, min(normalized_timeout, 60.0))
 
 
-def _get_pattern() -> re.Pattern[str]:
-    if _SHORTCODE_STRICT_MODE:
-        return _STRICT_SHORTCODE_PATTERN
-    return _RELAXED_SHORTCODE_PATTERN
-
-
 def _get_cache_path() -> Path:
     return _SHORTCODE_CACHE_PATH or _default_cache_path()
 
@@ -224,7 +225,7 @@ def _load_shortcodes_from_cache() -> dict[str, str]:
     if not cache_path.exists():
         return {}
     try:
-        payload = json.loads(cache_path.read_text(encoding="utf-8"))
+        payload = json.loads(cache_path.read_bytes())
         if isinstance(payload, dict) and isinstance(payload.get("shortcodes"), dict):
             data = payload["shortcodes"]
         elif isinstance(payload, dict):
@@ -248,7 +249,7 @@ def _save_shortcodes_to_cache(shortcodes: dict[str, str]) -> None:
             "shortcodes": shortcodes,
         }
         cache_path.write_text(
-            json.dumps(payload, ensure_ascii=False, indent=2),
+            json.dumps(payload, ensure_ascii=False, separators=(",", ":")),
             encoding="utf-8",
         )
     except Exception as e:
@@ -270,6 +271,19 @@ def _unified_to_emoji(unified: str) -> str:
     return "".join(chars)
 
 
+def _add_shortcode_aliases(result: dict[str, str], names, emoji: str) -> None:
+    """Add normalized shortcode names, plus the `_` variant for names with `-`."""
+    for name in names:
+        if not isinstance(name, str):
+            continue
+        normalized = name.strip().lower().strip(":")
+        if not normalized:
+            continue
+        result[normalized] = emoji
+        if "-" in normalized:
+            result[normalized.replace("-", "_")] = emoji
+
+
 def _parse_remote_shortcodes(payload) -> dict[str, str]:
     """
     Parse remote payload to shortcode->emoji map.
@@ -301,12 +315,7 @@ def _parse_remote_shortcodes(payload) -> dict[str, str]:
             emoji_char = item.get("emoji")
             aliases = item.get("aliases")
             if isinstance(emoji_char, str) and emoji_char and isinstance(aliases, list):
-                for alias in aliases:
-                    if isinstance(alias, str) and alias.strip():
-                        normalized = alias.lower().strip(":")
-                        if normalized:
-                            result[normalized] = emoji_char
-                            result[normalized.replace("-", "_")] = emoji_char
+                _add_shortcode_aliases(result, aliases, emoji_char)
 
             # iamcal format: {"unified": "...", "short_names": [...]}
             unified = item.get("unified") or item.get("non_qualified")
@@ -314,29 +323,37 @@ def _parse_remote_shortcodes(payload) -> dict[str, str]:
             if not emoji:
                 continue
 
-            names: set[str] = set()
             short_name = item.get("short_name")
-            if isinstance(short_name, str) and short_name.strip():
-                names.add(short_name.strip())
-
+            if isinstance(short_name, str):
+                _add_shortcode_aliases(result, (short_name,), emoji)
             short_names = item.get("short_names")
             if isinstance(short_names, list):
-                for short in short_names:
-                    if isinstance(short, str) and short.strip():
-                        names.add(short.strip())
-
-            for name in names:
-                normalized = name.lower().strip(":")
-                if not normalized:
-                    continue
-                result[normalized] = emoji
-                result[normalized.replace("-", "_")] = emoji
+                _add_shortcode_aliases(result, short_names, emoji)
 
         return result
 
     return result
 
 
+async def _fetch_remote_source_async(
+    session: aiohttp.ClientSession, url: str, headers: dict[str, str]
+) -> dict[str, str]:
+    try:
+        async with session.get(url, headers=headers) as response:
+            if response.status != 200:
+                raise RuntimeError(f"HTTP {response.status}")
+            payload = json.loads(await response.read())
+        shortcodes = _parse_remote_shortcodes(payload)
+        if shortcodes:
+            logger.debug(
+                f"Emoji shortcodes loaded from {url} (count={len(shortcodes)})"
+            )
+        return shortcodes
+    except Exception as e:
+        logger.warning(f"Failed to load emoji shortcodes from remote source {url}: {e}")
+        return {}
+
+
 async def _fetch_remote_shortcodes_async(urls: list[str]) -> dict[str, str]:
     merged: dict[str, str] = {}
     loaded_sources = 0
@@ -352,25 +369,20 @@ async def _fetch_remote_shortcodes_async(urls: list[str]) -> dict[str, str]:
         "User-Agent": "astrbot-matrix-sticker/emoji-shortcodes",
         "Accept": "application/json",
     }
+    connector = aiohttp.TCPConnector(limit_per_host=4, ttl_dns_cache=300)
+
+    async with aiohttp.ClientSession(
+        timeout=timeout, connector=connector, trust_env=True
+    ) as session:
+        results = await asyncio.gather(
+            *(_fetch_remote_source_async(session, url, headers) for url in urls)
+        )
 
-    async with aiohttp.ClientSession(timeout=timeout, trust_env=True) as session:
-        for url in urls:
-            try:
-                async with session.get(url, headers=headers) as response:
-                    if response.status != 200:
-                        raise RuntimeError(f"HTTP {response.status}")
-                    payload = json.loads(await response.text(encoding="utf-8"))
-                shortcodes = _parse_remote_shortcodes(payload)
-                if shortcodes:
-                    merged.update(shortcodes)
-                    loaded_sources += 1
-                    logger.debug(
-                        f"Emoji shortcodes loaded from {url} (count={len(shortcodes)})"
-                    )
-            except Exception as e:
-                logger.warning(
-                    f"Failed to load emoji shortcodes from remote source {url}: {e}"
-                )
+    # Merge in configured order so later sources still override earlier ones
+    for shortcodes in results:
+        if shortcodes:
+            merged.update(shortcodes)
+            loaded_sources += 1
 
     if loaded_sources > 1:
         logger.debug(
@@ -379,16 +391,20 @@ async def _fetch_remote_shortcodes_async(urls: list[str]) -> dict[str, str]:
     return merged
 
 
-def _fetch_remote_shortcodes() -> dict[str, str]:
+def _get_remote_shortcode_urls() -> list[str]:
     env_urls = os.environ.get(_SHORTCODES_URL_ENV, "").strip()
     if not env_urls:
         env_urls = os.environ.get(_LEGACY_SHORTCODES_URL_ENV, "").strip()
 
-    urls = (
+    return (
         [u.strip() for u in env_urls.split(",") if u.strip()]
         if env_urls
         else list(_DEFAULT_SHORTCODES_URLS)
     )
+
+
+def _fetch_remote_shortcodes() -> dict[str, str]:
+    urls = _get_remote_shortcode_urls()
     if not urls:
         return {}
 
@@ -421,6 +437,23 @@ def _fetch_remote_shortcodes() -> dict[str, str]:
     return result_holder["data"]
 
 
+def _apply_warmup_result(
+    cached_shortcodes: dict[str, str], remote_shortcodes: dict[str, str]
+) -> dict[str, str]:
+    global _EMOJI_SHORTCODES
+
+    if remote_shortcodes:
+        merged_shortcodes = dict(_FALLBACK_EMOJI_SHORTCODES)
+        merged_shortcodes.update(remote_shortcodes)
+        _EMOJI_SHORTCODES = merged_shortcodes
+        _save_shortcodes_to_cache(merged_shortcodes)
+    elif cached_shortcodes:
+        _EMOJI_SHORTCODES = cached_shortcodes
+    else:
+        _EMOJI_SHORTCODES = dict(_FALLBACK_EMOJI_SHORTCODES)
+    return _EMOJI_SHORTCODES
+
+
 def warmup_emoji_shortcodes(
     force_refresh: bool = False, fetch_remote: bool = False
 ) -> dict[str, str]:
@@ -438,22 +471,10 @@ def warmup_emoji_shortcodes(
         return _EMOJI_SHORTCODES
 
     cached_shortcodes = _load_shortcodes_from_cache()
-    should_fetch_remote = bool(fetch_remote) or bool(force_refresh)
-
-    if should_fetch_remote:
+    remote_shortcodes: dict[str, str] = {}
+    if fetch_remote or force_refresh:
         remote_shortcodes = _fetch_remote_shortcodes()
-        if remote_shortcodes:
-            merged_shortcodes = dict(_FALLBACK_EMOJI_SHORTCODES)
-            merged_shortcodes.update(remote_shortcodes)
-            _EMOJI_SHORTCODES = merged_shortcodes
-            _save_shortcodes_to_cache(merged_shortcodes)
-            return _EMOJI_SHORTCODES
-
-    if cached_shortcodes:
-        _EMOJI_SHORTCODES = cached_shortcodes
-    else:
-        _EMOJI_SHORTCODES = dict(_FALLBACK_EMOJI_SHORTCODES)
-    return _EMOJI_SHORTCODES
+    return _apply_warmup_result(cached_shortcodes, remote_shortcodes)
 
 
 def _get_emoji_shortcodes() -> dict[str, str]:
@@ -478,11 +499,14 @@ def convert_emoji_shortcodes(text: str) -> str:
     emoji_shortcodes = _get_emoji_shortcodes()
     if not emoji_shortcodes:
         return text
+    if _SHORTCODE_STRICT_MODE and text.count(":") < 2:
+        # Strict mode needs a pair of colons; a lone one (time, URL) cannot match.
+        return text.replace("\\:", ":")
 
-    pattern = _get_pattern()
+    pattern = _ACTIVE_SHORTCODE_PATTERN
 
     def _replace(match: re.Match[str]) -> str:
-        key = match.group(1).strip().lower()
+        key = match.group(1).lower()
         return emoji_shortcodes.get(key, match.group(0))
 
     converted = pattern.sub(_replace, text)
@@ -6,10 +6,16 @@ Matrix Sticker 管理插件
 """
 
 import asyncio
+import logging
 import math
+import re
 import shlex
+import time
+import weakref
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 from astrbot.api import logger
@@ -25,6 +31,9 @@ from .commands import (
 )
 from .emoji_shortcodes import configure_emoji_shortcodes, warmup_emoji_shortcodes
 
+# 与 shlex 的默认空白字符保持一致，避免快速路径按全角空格等额外切分
+_COMMAND_ARG_SEPARATOR = re.compile(r"[ \t\r\n]+")
+
 
 @register(
     name="astrbot_plugin_matrix_sticker",
@@ -41,6 +50,11 @@ class MatrixStickerPlugin(
     """Matrix Sticker 管理插件"""
 
     _AUTO_SYNC_INTERVAL_SECONDS = 180
+    _ROOM_SYNC_CONCURRENCY = 8
+    _PLATFORM_SYNC_CONCURRENCY = 4
+    _JOINED_ROOMS_TTL_SECONDS = 900.0
+    _PLATFORM_FLAG_AVAILABILITY_RESET = 1
+    _PLATFORM_FLAG_USER_SYNCED = 2
     _DEFAULT_STORAGE_RELOAD_INTERVAL_SECONDS = 3.0
     _MUTATING_STICKER_SUBCOMMANDS = {
         "save",
@@ -52,6 +66,31 @@ class MatrixStickerPlugin(
         "mode",
     }
     _MUTATING_ALIAS_SUBCOMMANDS = {"add", "remove"}
+    _PROMPT_MODE_INPUTS = frozenset(
+        {
+            "on",
+            "off",
+            "enable",
+            "enabled",
+            "disable",
+            "disabled",
+            "true",
+            "false",
+            "1",
+            "0",
+            "yes",
+            "no",
+            "inject",
+            "injection",
+            "runtime",
+            "prompt",
+            "fc",
+            "tool",
+            "tools",
+            "hybrid",
+            "both",
+        }
+    )
 
     def __init__(self, context: Context, config: dict | None = None):
         super().__init__(context, config)
@@ -62,17 +101,41 @@ class MatrixStickerPlugin(
         self._auto_sync_task: asyncio.Task | None = None
         self._auto_sync_lock: asyncio.Lock | None = None
         self._startup_sync_task: asyncio.Task | None = None
-        self._user_synced_platform_ids: set[str] = set()
-        self._availability_reset_platform_ids: set[str] = set()
+        self._platform_sync_flags: dict[str, int] = {}
+        self._platform_key_cache: weakref.WeakKeyDictionary[Any, str] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._matrix_platforms_cache: tuple | None = None
         self._shortcode_lookup_cache: dict[str, str] | None = None
+        self._shortcode_index_keys: dict[str, set[str]] = {}
+        self._shortcode_tag_keys: set[str] = set()
+        self._sticker_meta_id_index: dict[str, Any] | None = None
+        self._sorted_sticker_ids: list[str] | None = None
+        self._shortcode_resolution_cache: OrderedDict[str, Any] | None = None
+        self._local_path_exists_cache: dict[str, float] = {}
+        self._storage_index_version = 0
         self._last_storage_reload_monotonic = 0.0
+        self._storage_index_mtime_ns: int | None = None
+        self._index_dirty = False
+        self._index_flush_task: asyncio.Task | None = None
+        self._matrix_lookup_cache: dict[str, Any] | None = None
+        self._room_emote_state_keys: dict[str, tuple[float, tuple[str, ...]]] = {}
+        self._joined_rooms_cache: dict[str, tuple[float, list[str]]] = {}
+        self._prompt_cache: tuple[tuple[int, int], tuple[str, int] | None] | None = None
+        self._stats_cache: tuple[int, dict[str, Any]] | None = None
         self._storage_reload_interval_seconds = (
             self._resolve_storage_reload_interval_seconds()
         )
+        self._emoji_shortcodes_enabled = self._resolve_emoji_shortcodes_enabled()
+        self._shortcode_strict_mode = self._resolve_shortcode_strict_mode()
+        self._sticker_auto_sync_enabled = self._resolve_sticker_auto_sync_enabled()
+        self._sticker_sync_user_emotes_enabled = (
+            self._resolve_sticker_sync_user_emotes_enabled()
+        )
 
         configure_emoji_shortcodes(
-            enabled=self._is_emoji_shortcodes_enabled(),
-            strict_mode=self._is_shortcode_strict_mode(),
+            enabled=self._emoji_shortcodes_enabled,
+            strict_mode=self._shortcode_strict_mode,
         )
         warmup_emoji_shortcodes(fetch_remote=False)
 
@@ -95,7 +158,7 @@ class MatrixStickerPlugin(
         except Exception:
             return False
 
-    def _is_emoji_shortcodes_enabled(self) -> bool:
+    def _resolve_emoji_shortcodes_enabled(self) -> bool:
         if "emoji_shortcodes" in self.config:
             return self._parse_bool_like(self.config.get("emoji_shortcodes"), False)
         if "matrix_sticker_emoji_shortcodes" in self.config:
@@ -107,7 +170,7 @@ class MatrixStickerPlugin(
             self.config.get("matrix_emoji_shortcodes", False), False
         )
 
-    def _is_shortcode_strict_mode(self) -> bool:
+    def _resolve_shortcode_strict_mode(self) -> bool:
         if "emoji_shortcodes_strict_mode" in self.config:
             return self._parse_bool_like(
                 self.config.get("emoji_shortcodes_strict_mode"),
@@ -123,24 +186,46 @@ class MatrixStickerPlugin(
             False,
         )
 
-    def _is_sticker_auto_sync_enabled(self) -> bool:
+    def _resolve_sticker_auto_sync_enabled(self) -> bool:
         return self._parse_bool_like(
             self.config.get("matrix_sticker_auto_sync", False),
             False,
         )
 
-    def _is_sticker_sync_user_emotes_enabled(self) -> bool:
+    def _resolve_sticker_sync_user_emotes_enabled(self) -> bool:
         return self._parse_bool_like(
             self.config.get("matrix_sticker_sync_user_emotes", False),
             False,
         )
 
+    # 配置在插件重载前不会变化，开关在 __init__ 中解析一次，热路径只读属性
+    def _is_emoji_shortcodes_enabled(self) -> bool:
+        return self._emoji_shortcodes_enabled
+
+    def _is_shortcode_strict_mode(self) -> bool:
+        return self._shortcode_strict_mode
+
+    def _is_sticker_auto_sync_enabled(self) -> bool:
+        return self._sticker_auto_sync_enabled
+
+    def _is_sticker_sync_user_emotes_enabled(self) -> bool:
+        return self._sticker_sync_user_emotes_enabled
+
+    def _get_matrix_platform_candidates(self) -> tuple:
+        """带 sticker_syncer 的平台实例，平台加载或重载时由 on_platform_loaded 清空。"""
+        platforms = self._matrix_platforms_cache
+        if platforms is None:
+            platforms = tuple(
+                platform
+                for platform in self._iter_platform_instances()
+                if hasattr(platform, "sticker_syncer") and hasattr(platform, "client")
+            )
+            self._matrix_platforms_cache = platforms
+        return platforms
+
     def _iter_matrix_platforms(self):
-        for platform in self._iter_platform_instances():
-            if not hasattr(platform, "sticker_syncer") or not hasattr(
-                platform, "client"
-            ):
-                continue
+        # 登录状态会变化，client/user_id 仍每次检查
+        for platform in self._get_matrix_platform_candidates():
             client = getattr(platform, "client", None)
             if client is None:
                 continue
@@ -150,7 +235,22 @@ class MatrixStickerPlugin(
             yield platform
 
     def _platform_sync_key(self, platform) -> str:
-        return str(getattr(platform, "client_self_id", "") or id(platform))
+        try:
+            cached = self._platform_key_cache.get(platform)
+        except TypeError:
+            cached = None
+        if cached is not None:
+            return cached
+        self_id = getattr(platform, "client_self_id", "")
+        if not self_id:
+            # 登录完成前还没有 self_id，此时不缓存 id() 回退值，避免之后沿用旧键
+            return str(id(platform))
+        key = str(self_id)
+        try:
+            self._platform_key_cache[platform] = key
+        except TypeError:
+            pass
+        return key
 
     def _is_client_ready(self, client) -> bool:
         return bool(
@@ -159,6 +259,36 @@ class MatrixStickerPlugin(
             and getattr(client, "access_token", None)
         )
 
+    async def _get_joined_room_ids(self, platform_key: str, client) -> list[str] | None:
+        """获取已加入的房间列表，按平台缓存，房间成员关系很少在两次同步间变化"""
+        now = time.monotonic()
+        entry = self._joined_rooms_cache.get(platform_key)
+        if entry is not None and now - entry[0] < self._JOINED_ROOMS_TTL_SECONDS:
+            return entry[1]
+
+        try:
+            joined_rooms = await client.get_joined_rooms()
+        except Exception as e:
+            self._joined_rooms_cache.pop(platform_key, None)
+            logger.debug(f"Load joined rooms failed for {platform_key}: {e}")
+            return None
+        if isinstance(joined_rooms, dict):
+            joined_rooms = joined_rooms.get("joined_rooms", [])
+        if not isinstance(joined_rooms, (list, tuple, set)):
+            self._joined_rooms_cache.pop(platform_key, None)
+            logger.debug(
+                f"Invalid joined rooms response for {platform_key}: {joined_rooms}"
+            )
+            return None
+
+        room_ids = [
+            normalized
+            for normalized in (str(room_id or "").strip() for room_id in joined_rooms)
+            if normalized
+        ]
+        self._joined_rooms_cache[platform_key] = (now, room_ids)
+        return room_ids
+
     async def _sync_platform_stickers(self, platform) -> None:
         syncer = getattr(platform, "sticker_syncer", None)
         client = getattr(platform, "client", None)
@@ -170,11 +300,13 @@ class MatrixStickerPlugin(
 
         platform_key = self._platform_sync_key(platform)
 
-        if platform_key not in self._availability_reset_platform_ids:
+        flags = self._platform_sync_flags.get(platform_key, 0)
+        if not flags & self._PLATFORM_FLAG_AVAILABILITY_RESET:
             try:
                 if hasattr(syncer, "reset_available"):
                     syncer.reset_available()
-                self._availability_reset_platform_ids.add(platform_key)
+                flags |= self._PLATFORM_FLAG_AVAILABILITY_RESET
+                self._platform_sync_flags[platform_key] = flags
             except Exception as e:
                 logger.debug(
                     f"Reset sticker availability failed for {platform_key}: {e}"
@@ -182,38 +314,45 @@ class MatrixStickerPlugin(
 
         if (
             self._is_sticker_sync_user_emotes_enabled()
-            and platform_key not in self._user_synced_platform_ids
+            and not flags & self._PLATFORM_FLAG_USER_SYNCED
         ):
             try:
                 user_count = await syncer.sync_user_stickers()
                 if user_count > 0:
                     logger.info(f"Synced {user_count} user stickers on {platform_key}")
-                self._user_synced_platform_ids.add(platform_key)
+                flags |= self._PLATFORM_FLAG_USER_SYNCED
+                self._platform_sync_flags[platform_key] = flags
             except Exception as e:
                 logger.debug(f"Sync user stickers failed for {platform_key}: {e}")
 
-        try:
-            joined_rooms = await client.get_joined_rooms()
-        except Exception as e:
-            logger.debug(f"Load joined rooms failed for {platform_key}: {e}")
-            return
-        if isinstance(joined_rooms, dict):
-            joined_rooms = joined_rooms.get("joined_rooms", [])
-        if not isinstance(joined_rooms, (list, tuple, set)):
-            logger.debug(
-                f"Invalid joined rooms response for {platform_key}: {joined_rooms}"
-            )
+        room_ids = await self._get_joined_room_ids(platform_key, client)
+        if room_ids is None:
             return
+        semaphore = asyncio.Semaphore(self._ROOM_SYNC_CONCURRENCY)
 
+        async def _sync_room(room_id: str) -> int:
+            async with semaphore:
+                return await syncer.sync_room_stickers(room_id)
+
+        results = await asyncio.gather(
+            *(_sync_room(room_id) for room_id in room_ids), return_exceptions=True
+        )
         total_synced = 0
-        for room_id in joined_rooms:
-            try:
-                normalized_room_id = str(room_id or "").strip()
-                if not normalized_room_id:
-                    continue
-                total_synced += await syncer.sync_room_stickers(normalized_room_id)
-            except Exception as room_e:
-                logger.debug(f"Sync room stickers failed for {room_id}: {room_e}")
+        failures: list[tuple[str, BaseException]] = []
+        for room_id, result in zip(room_ids, results):
+            if isinstance(result, BaseException):
+                failures.append((room_id, result))
+            else:
+                total_synced += int(result or 0)
+        # 失败房间合并为一条日志，调试级别关闭时跳过拼接
+        if failures and logger.isEnabledFor(logging.DEBUG):
+            details = "; ".join(f"{room_id}: {e}" for room_id, e in failures[:5])
+            if len(failures) > 5:
+                details += f" …(+{len(failures) - 5} more)"
+            logger.debug(
+                f"Sync room stickers failed for {len(failures)} rooms "
+                f"on {platform_key}: {details}"
+            )
 
         if total_synced > 0:
             logger.info(f"Synced {total_synced} room stickers on {platform_key}")
@@ -224,8 +363,19 @@ class MatrixStickerPlugin(
         if self._auto_sync_lock is None:
             self._auto_sync_lock = asyncio.Lock()
         async with self._auto_sync_lock:
-            for platform in self._iter_matrix_platforms():
-                await self._sync_platform_stickers(platform)
+            semaphore = asyncio.Semaphore(self._PLATFORM_SYNC_CONCURRENCY)
+
+            async def _sync_platform(platform) -> None:
+                async with semaphore:
+                    await self._sync_platform_stickers(platform)
+
+            results = await asyncio.gather(
+                *(_sync_platform(p) for p in self._iter_matrix_platforms()),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    logger.debug(f"Sync platform stickers failed: {result}")
 
     async def _startup_sync_when_ready(self) -> None:
         for _ in range(30):
@@ -263,7 +413,7 @@ class MatrixStickerPlugin(
         self._startup_sync_task.add_done_callback(self._handle_startup_sync_task_done)
 
     async def _auto_sync_loop(self) -> None:
-        while True:
+        while self._is_sticker_auto_sync_enabled():
             try:
                 await self._sync_all_platform_stickers_once()
             except Exception as e:
@@ -294,6 +444,33 @@ class MatrixStickerPlugin(
         )
         self._auto_sync_task.add_done_callback(self._handle_auto_sync_task_done)
 
+    @staticmethod
+    async def _cancel_task(task: asyncio.Task | None) -> None:
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def reconfigure_auto_sync(self) -> None:
+        """重新读取同步开关并重启自动同步任务，无需重载插件"""
+        self._sticker_auto_sync_enabled = self._resolve_sticker_auto_sync_enabled()
+        self._sticker_sync_user_emotes_enabled = (
+            self._resolve_sticker_sync_user_emotes_enabled()
+        )
+
+        task = self._auto_sync_task
+        self._auto_sync_task = None
+        await self._cancel_task(task)
+
+        # 清除标记后下一轮会重新 reset_available，房间列表也需重新获取，
+        # 保证所有房间的 sticker 都被重新同步并标记为可用
+        self._platform_sync_flags.clear()
+        self._joined_rooms_cache.clear()
+        self._ensure_auto_sync_task()
+
     def _save_runtime_config(self) -> None:
         save_config = getattr(self.config, "save_config", None)
         if callable(save_config):
@@ -323,6 +500,9 @@ class MatrixStickerPlugin(
         text = str(message_text or "").strip()
         if not text:
             return []
+        # shlex 是逐字符的纯 Python 词法器，只有出现引号或转义时才需要它
+        if '"' not in text and "'" not in text and "\\" not in text:
+            return [arg for arg in _COMMAND_ARG_SEPARATOR.split(text) if arg]
         try:
             return shlex.split(text)
         except ValueError:
@@ -380,6 +560,130 @@ class MatrixStickerPlugin(
         except (OSError, RuntimeError, ValueError):
             return raw_path, False
 
+    # ========== Subcommand Handlers ==========
+    # 每个处理方法返回要回复的文本，返回 None 表示不回复
+
+    async def _sticker_sub_help(self, event: AstrMessageEvent, args: list[str]):
+        return self._get_help_text()
+
+    async def _sticker_sub_list(self, event: AstrMessageEvent, args: list[str]):
+        pack_name = args[2] if len(args) > 2 else None
+        return await self.cmd_list_stickers(pack_name)
+
+    async def _sticker_sub_packs(self, event: AstrMessageEvent, args: list[str]):
+        return await self.cmd_list_packs()
+
+    async def _sticker_sub_search(self, event: AstrMessageEvent, args: list[str]):
+        keyword = " ".join(args[2:]).strip() if len(args) > 2 else ""
+        return await self.cmd_search_stickers(event, keyword)
+
+    async def _sticker_sub_save(self, event: AstrMessageEvent, args: list[str]):
+        pack_name = args[3] if len(args) > 3 else None
+        return await self.cmd_save_sticker(event, args[2], pack_name)
+
+    async def _sticker_sub_send(self, event: AstrMessageEvent, args: list[str]):
+        result = await self.cmd_send_sticker(event, args[2])
+        return result if isinstance(result, str) else None
+
+    async def _sticker_sub_delete(self, event: AstrMessageEvent, args: list[str]):
+        return await self.cmd_delete_sticker(args[2])
+
+    async def _sticker_sub_stats(self, event: AstrMessageEvent, args: list[str]):
+        return self.cmd_get_stats()
+
+    async def _sticker_sub_sync(self, event: AstrMessageEvent, args: list[str]):
+        return await self.cmd_sync_room_stickers(event)
+
+    async def _sticker_sub_reindex(self, event: AstrMessageEvent, args: list[str]):
+        return await self.cmd_reindex_stickers()
+
+    async def _sticker_sub_addroom(self, event: AstrMessageEvent, args: list[str]):
+        state_key = args[3] if len(args) > 3 else ""
+        return await self.cmd_add_room_emote(event, args[2], state_key)
+
+    async def _sticker_sub_removeroom(self, event: AstrMessageEvent, args: list[str]):
+        state_key = args[3] if len(args) > 3 else ""
+        return await self.cmd_remove_room_emote(event, args[2], state_key)
+
+    async def _sticker_sub_roomlist(self, event: AstrMessageEvent, args: list[str]):
+        state_key = args[2] if len(args) > 2 else ""
+        return await self.cmd_list_room_emotes(event, state_key)
+
+    async def _sticker_sub_mode(self, event: AstrMessageEvent, args: list[str]):
+        if len(args) < 3:
+            current = self._get_prompt_injection_mode()
+            return (
+                "当前 Sticker 提示词注入："
+                f"{current}\n"
+                "可选值：on | off\n"
+                "用法：/sticker mode <on|off>\n"
+                "说明：仅控制提示词注入；"
+                "sticker_search/sticker_send 工具默认启用，启停请在 WebUI 手动操作。"
+            )
+
+        raw_mode = args[2].strip().lower()
+        if raw_mode not in self._PROMPT_MODE_INPUTS:
+            return "无效参数。可选值：on | off\n用法：/sticker mode <on|off>"
+
+        new_mode = self._set_prompt_injection_runtime(raw_mode, persist=True)
+        return (
+            "已更新 Sticker 提示词注入："
+            f"{new_mode}\n"
+            "sticker_search/sticker_send 工具启停请在 WebUI 手动管理。"
+        )
+
+    async def _alias_sub_add(self, event: AstrMessageEvent, args: list[str]):
+        return await self.cmd_add_alias(args[2], args[3])
+
+    async def _alias_sub_remove(self, event: AstrMessageEvent, args: list[str]):
+        return await self.cmd_remove_alias(args[2], args[3])
+
+    async def _alias_sub_list(self, event: AstrMessageEvent, args: list[str]):
+        return await self.cmd_list_aliases(args[2])
+
+    # 子命令 -> (处理方法, 最少参数个数, 参数不足时的用法提示)
+    _STICKER_SUBCOMMANDS = MappingProxyType(
+        {
+            "help": (_sticker_sub_help, 0, None),
+            "list": (_sticker_sub_list, 0, None),
+            "packs": (_sticker_sub_packs, 0, None),
+            "search": (_sticker_sub_search, 0, None),
+            "save": (_sticker_sub_save, 3, "用法：/sticker save <name> [pack]"),
+            "send": (_sticker_sub_send, 3, "用法：/sticker send <id|name>"),
+            "delete": (_sticker_sub_delete, 3, "用法：/sticker delete <id>"),
+            "stats": (_sticker_sub_stats, 0, None),
+            "sync": (_sticker_sub_sync, 0, None),
+            "reindex": (_sticker_sub_reindex, 0, None),
+            "addroom": (
+                _sticker_sub_addroom,
+                3,
+                (
+                    "用法：/sticker addroom <shortcode> [pack]\n"
+                    "请先引用一条包含图片的消息，然后发送此命令\n"
+                    "pack 为可选的表情包名称"
+                ),
+            ),
+            "removeroom": (
+                _sticker_sub_removeroom,
+                3,
+                "用法：/sticker removeroom <shortcode> [pack]",
+            ),
+            "roomlist": (_sticker_sub_roomlist, 0, None),
+            "mode": (_sticker_sub_mode, 0, None),
+        }
+    )
+    _ALIAS_SUBCOMMANDS = MappingProxyType(
+        {
+            "add": (_alias_sub_add, 4, "用法：/sticker_alias add <sticker_id> <alias>"),
+            "remove": (
+                _alias_sub_remove,
+                4,
+                "用法：/sticker_alias remove <sticker_id> <alias>",
+            ),
+            "list": (_alias_sub_list, 3, "用法：/sticker_alias list <sticker_id>"),
+        }
+    )
+
     # ========== Command Bindings ==========
     # 装饰器必须定义在 main.py 中，逻辑委托给 mixin
 
@@ -396,7 +700,10 @@ class MatrixStickerPlugin(
         if len(args) < 2:
             args.append("help")
 
-        subcommand = args[1].lower() if len(args) > 1 else "help"
+        # 子命令通常已是小写，命中分发表时跳过 lower()
+        subcommand = args[1]
+        if subcommand not in self._STICKER_SUBCOMMANDS:
+            subcommand = subcommand.lower()
 
         if (
             subcommand in self._MUTATING_STICKER_SUBCOMMANDS
@@ -405,142 +712,20 @@ class MatrixStickerPlugin(
             yield event.plain_result("权限不足：该子命令仅管理员可用。")
             return
 
-        if subcommand == "help":
-            yield event.plain_result(self._get_help_text())
-
-        elif subcommand == "list":
-            pack_name = args[2] if len(args) > 2 else None
-            result = await self.cmd_list_stickers(pack_name)
-            yield event.plain_result(result)
-
-        elif subcommand == "packs":
-            result = self.cmd_list_packs()
-            yield event.plain_result(result)
-
-        elif subcommand == "search":
-            keyword = " ".join(args[2:]).strip() if len(args) > 2 else ""
-            result = await self.cmd_search_stickers(event, keyword)
-            yield event.plain_result(result)
-
-        elif subcommand == "save":
-            if len(args) < 3:
-                yield event.plain_result("用法：/sticker save <name> [pack]")
-                return
-            name = args[2]
-            pack_name = args[3] if len(args) > 3 else None
-            result = await self.cmd_save_sticker(event, name, pack_name)
-            yield event.plain_result(result)
-
-        elif subcommand == "send":
-            if len(args) < 3:
-                yield event.plain_result("用法：/sticker send <id|name>")
-                return
-            identifier = args[2]
-            result = await self.cmd_send_sticker(event, identifier)
-            if isinstance(result, str):
-                yield event.plain_result(result)
-
-        elif subcommand == "delete":
-            if len(args) < 3:
-                yield event.plain_result("用法：/sticker delete <id>")
-                return
-            sticker_id = args[2]
-            result = await self.cmd_delete_sticker(sticker_id)
-            yield event.plain_result(result)
-
-        elif subcommand == "stats":
-            result = self.cmd_get_stats()
-            yield event.plain_result(result)
-
-        elif subcommand == "sync":
-            result = await self.cmd_sync_room_stickers(event)
-            yield event.plain_result(result)
-
-        elif subcommand == "reindex":
-            result = await self.cmd_reindex_stickers()
-            yield event.plain_result(result)
-
-        elif subcommand == "addroom":
-            if len(args) < 3:
-                yield event.plain_result(
-                    "用法：/sticker addroom <shortcode> [pack]\n"
-                    "请先引用一条包含图片的消息，然后发送此命令\n"
-                    "pack 为可选的表情包名称"
-                )
-                return
-            shortcode = args[2]
-            state_key = args[3] if len(args) > 3 else ""
-            result = await self.cmd_add_room_emote(event, shortcode, state_key)
-            yield event.plain_result(result)
-
-        elif subcommand == "removeroom":
-            if len(args) < 3:
-                yield event.plain_result("用法：/sticker removeroom <shortcode> [pack]")
-                return
-            shortcode = args[2]
-            state_key = args[3] if len(args) > 3 else ""
-            result = await self.cmd_remove_room_emote(event, shortcode, state_key)
-            yield event.plain_result(result)
-
-        elif subcommand == "roomlist":
-            state_key = args[2] if len(args) > 2 else ""
-            result = await self.cmd_list_room_emotes(event, state_key)
-            yield event.plain_result(result)
-
-        elif subcommand == "mode":
-            if len(args) < 3:
-                current = self._get_prompt_injection_mode()
-                yield event.plain_result(
-                    "当前 Sticker 提示词注入："
-                    f"{current}\n"
-                    "可选值：on | off\n"
-                    "用法：/sticker mode <on|off>\n"
-                    "说明：仅控制提示词注入；"
-                    "sticker_search/sticker_send 工具默认启用，启停请在 WebUI 手动操作。"
-                )
-                return
-
-            raw_mode = args[2].strip().lower()
-            valid_inputs = {
-                "on",
-                "off",
-                "enable",
-                "enabled",
-                "disable",
-                "disabled",
-                "true",
-                "false",
-                "1",
-                "0",
-                "yes",
-                "no",
-                "inject",
-                "injection",
-                "runtime",
-                "prompt",
-                "fc",
-                "tool",
-                "tools",
-                "hybrid",
-                "both",
-            }
-            if raw_mode not in valid_inputs:
-                yield event.plain_result(
-                    "无效参数。可选值：on | off\n用法：/sticker mode <on|off>"
-                )
-                return
-
-            new_mode = self._set_prompt_injection_runtime(raw_mode, persist=True)
-            yield event.plain_result(
-                "已更新 Sticker 提示词注入："
-                f"{new_mode}\n"
-                "sticker_search/sticker_send 工具启停请在 WebUI 手动管理。"
-            )
-
-        else:
+        entry = self._STICKER_SUBCOMMANDS.get(subcommand)
+        if entry is None:
             yield event.plain_result(
                 f"未知子命令：{subcommand}\n" + self._get_help_text()
             )
+            return
+
+        handler, min_args, usage = entry
+        if len(args) < min_args:
+            yield event.plain_result(usage)
+            return
+        result = await handler(self, event, args)
+        if result is not None:
+            yield event.plain_result(result)
 
     @filter.command("sticker_alias")
     async def sticker_alias_command(self, event: AstrMessageEvent):
@@ -554,7 +739,9 @@ class MatrixStickerPlugin(
             yield event.plain_result(self._get_alias_help_text())
             return
 
-        subcommand = args[1].lower()
+        subcommand = args[1]
+        if subcommand not in self._ALIAS_SUBCOMMANDS:
+            subcommand = subcommand.lower()
 
         if subcommand in self._MUTATING_ALIAS_SUBCOMMANDS and not self._is_admin_event(
             event
@@ -562,38 +749,16 @@ class MatrixStickerPlugin(
             yield event.plain_result("权限不足：该子命令仅管理员可用。")
             return
 
-        if subcommand == "add":
-            if len(args) < 4:
-                yield event.plain_result(
-                    "用法：/sticker_alias add <sticker_id> <alias>"
-                )
-                return
-            sticker_id = args[2]
-            alias = args[3]
-            result = self.cmd_add_alias(sticker_id, alias)
-            yield event.plain_result(result)
-
-        elif subcommand == "remove":
-            if len(args) < 4:
-                yield event.plain_result(
-                    "用法：/sticker_alias remove <sticker_id> <alias>"
-                )
-                return
-            sticker_id = args[2]
-            alias = args[3]
-            result = self.cmd_remove_alias(sticker_id, alias)
-            yield event.plain_result(result)
-
-        elif subcommand == "list":
-            if len(args) < 3:
-                yield event.plain_result("用法：/sticker_alias list <sticker_id>")
-                return
-            sticker_id = args[2]
-            result = self.cmd_list_aliases(sticker_id)
-            yield event.plain_result(result)
-
-        else:
+        entry = self._ALIAS_SUBCOMMANDS.get(subcommand)
+        if entry is None:
             yield event.plain_result(self._get_alias_help_text())
+            return
+
+        handler, min_args, usage = entry
+        if len(args) < min_args:
+            yield event.plain_result(usage)
+            return
+        yield event.plain_result(await handler(self, event, args))
 
     @filter.llm_tool(name="sticker_search")
     async def tool_sticker_search(
@@ -762,27 +927,29 @@ class MatrixStickerPlugin(
     @filter.on_platform_loaded()
     async def on_platform_loaded(self):
         """Run one startup sync pass after Matrix login is ready."""
+        self._invalidate_matrix_lookup_cache()
+        self._matrix_platforms_cache = None
         self._ensure_startup_sync_task()
 
     async def terminate(self):
         self._shortcode_lookup_cache = None
+        self._shortcode_resolution_cache = None
+        self._stats_cache = None
+        self._joined_rooms_cache.clear()
+        self._matrix_platforms_cache = None
+        self._sticker_meta_id_index = None
+        self._sorted_sticker_ids = None
         self._last_storage_reload_monotonic = 0.0
+        self._invalidate_matrix_lookup_cache()
+        self._flush_pending_index_save()
 
-        if self._startup_sync_task and not self._startup_sync_task.done():
-            self._startup_sync_task.cancel()
-            try:
-                await self._startup_sync_task
-            except asyncio.CancelledError:
-                pass
+        # 两个后台任务一起取消，任一任务清理时抛错也不影响另一个
+        tasks = (self._startup_sync_task, self._auto_sync_task)
         self._startup_sync_task = None
-
-        if self._auto_sync_task and not self._auto_sync_task.done():
-            self._auto_sync_task.cancel()
-            try:
-                await self._auto_sync_task
-            except asyncio.CancelledError:
-                pass
         self._auto_sync_task = None
+        await asyncio.gather(
+            *(self._cancel_task(task) for task in tasks), return_exceptions=True
+        )
 
         vector_provider = getattr(self, "_vector_provider", None)
         if vector_provider is not None: